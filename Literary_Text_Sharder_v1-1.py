@@ -15,12 +15,15 @@ Features:
 * Enhanced literary index with metadata
 * Zero manual preprocessing required
 * On-the-fly shard writing to prevent memory overflow
+* Msty responses cached in ~/.cache/literary_sharder, so re-runs skip repeat analysis
 
 Requirements:
 ------------
 * Python 3.9+
 * Msty app running with Llama 3.2 (or compatible model)
 * requests library
+* pyahocorasick (optional, faster keyword matching)
+* orjson (optional, faster JSON parsing and index writing)
 
 Usage:
 ------
@@ -30,50 +33,234 @@ Usage:
 4. Get intelligent shards ready for detailed AI analysis
 """
 
+import dbm
+import hashlib
+import importlib.util
 import json
+import mmap
 import os
 import re
+import string
 import sys
+import threading
 import datetime
-from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict, Counter
+from typing import Dict, Iterator, List, Set, Tuple, Optional
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import islice
+from types import SimpleNamespace
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# rich gives a better UI (optional). It is only imported once a Rich UI is
+# actually shown, so scripted runs don't pay its import cost.
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+_rich = None
+
+
+def _get_rich() -> SimpleNamespace:
+    """Import the rich components used by the UI on first call and cache them."""
+    global _rich
+    if _rich is None:
+        from rich.console import Console
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.prompt import Prompt, Confirm
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
+        _rich = SimpleNamespace(console=Console(), Panel=Panel, Table=Table, Prompt=Prompt,
+                                Confirm=Confirm, Progress=Progress, SpinnerColumn=SpinnerColumn,
+                                TextColumn=TextColumn)
+    return _rich
+
+# Try to import orjson for faster JSON parsing/writing (optional)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# Try to import rich for better UI (optional)
+# Try to import pyahocorasick for fast multi-keyword matching (optional)
 try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.prompt import Prompt, Confirm
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-
-    RICH_AVAILABLE = True
-    console = Console()
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    RICH_AVAILABLE = False
-    console = None
+    AHOCORASICK_AVAILABLE = False
+
+# Chapter/section heading patterns, in priority order
+CHAPTER_PATTERNS = [
+    r'^Chapter\s+\d+',
+    r'^CHAPTER\s+[IVXLC]+',
+    r'^Book\s+\d+',
+    r'^Part\s+\d+',
+    r'^Act\s+[IVXLC]+',
+    r'^Scene\s+[IVXLC]+',
+    r'^\d+\.',
+    r'^[IVXLC]+\.',
+]
+
+# All heading patterns as one alternation, anchored at the start of any line
+# (after indentation); group N+1 identifies CHAPTER_PATTERNS[N]. \s is narrowed
+# to [^\S\n] so a heading can never run onto the next line.
+CHAPTER_RE = re.compile(
+    r'^[^\S\n]*(?:' +
+    '|'.join('(' + pattern[1:].replace(r'\s', r'[^\S\n]') + ')' for pattern in CHAPTER_PATTERNS) +
+    ')',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Capitalized words (3+ letters) considered as potential character names
+CAPITALIZED_WORD_RE = re.compile(r'\b[A-Z][a-z]{2,}\b')
+
+# Capitalized words that are too common to be names
+COMMON_WORDS = frozenset({'The', 'And', 'But', 'When', 'Where', 'What', 'Who', 'How', 'Why',
+                          'This', 'That', 'These', 'Those', 'Then', 'Now', 'Here', 'There'})
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text, ignoring case.
+
+    Uses a single Aho-Corasick pass when pyahocorasick is installed, otherwise
+    falls back to one substring check per keyword.
+    """
+
+    def __init__(self, keywords):
+        # Original spellings per lowercased key, with their position in `keywords`
+        self.ranked = defaultdict(list)
+        for rank, keyword in enumerate(keywords):
+            self.ranked[keyword.lower()].append((rank, keyword))
+        self.keys = list(self.ranked)
+        self.automaton = None
+
+        if AHOCORASICK_AVAILABLE and self.keys:
+            self.automaton = ahocorasick.Automaton()
+            for key in self.keys:
+                self.automaton.add_word(key, key)
+            self.automaton.make_automaton()
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Return the (lowercased) keywords present in an already lowercased text."""
+        if self.automaton is None:
+            return {key for key in self.keys if key in text_lower}
+        return {key for _, key in self.automaton.iter(text_lower)}
+
+    def matches(self, text_lower: str, limit: Optional[int] = None) -> List[str]:
+        """Return the original keywords present in text_lower, in the order they were given.
+
+        Only the keywords actually found are ordered, so this doesn't cost a pass
+        over every keyword; ``limit`` keeps just the first few.
+        """
+        found = self.find(text_lower)
+        if not found:
+            return []
+        hits = sorted(hit for key in found for hit in self.ranked[key])
+        return [keyword for _, keyword in hits[:limit]]
+
+
+# A word, for sizing analysis windows (same as str.split())
+WORD_RE = re.compile(r'\S+')
+
+# Three or more consecutive line breaks, collapsed when loading a text
+EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
+# A paragraph: a run of lines with no empty line between them. Same blocks as
+# text.split('\n\n'), but found one at a time.
+PARAGRAPH_RE = re.compile(r'[^\n]+(?:\n(?!\n)[^\n]+)*')
+
+# Section boundaries for thematic sharding: blank lines or chapter markers
+SECTION_BREAK_RE = re.compile(r'\n\s*\n|\n(?=Chapter|\nBook|\nPart)')
+
+# A line break, for mapping line numbers to text offsets
+NEWLINE_RE = re.compile(r'\n')
+
+# Characters stripped from shard names to make them safe filenames
+UNSAFE_NAME_CHARS_RE = re.compile(r'[^\w\s-]')
+
+# Translation table that deletes the characters allowed in a character name,
+# apart from whitespace (checked separately with str.isspace)
+NAME_CHARS_DELETE_TABLE = str.maketrans('', '', string.ascii_letters + "-'.")
+
+# Below this many shards the index is built in-process rather than in a process pool
+INDEX_PARALLEL_MIN_SHARDS = 32
+
+# Prompt for discovering literary elements
+ELEMENT_DISCOVERY_PROMPT = """Analyze this literary text excerpt carefully. Extract and list:
+
+1. CHARACTER NAMES: Any character names mentioned (first names, last names, titles)
+2. THEMES: Major themes, concepts, or ideas explored
+3. LOCATIONS: Places, settings, geographical references
+4. TIME INDICATORS: Historical periods, seasons, times of day
+5. NARRATIVE TECHNIQUES: Point of view, literary devices used
+
+Format your response as a JSON object with these exact keys:
+{
+    "characters": ["name1", "name2"],
+    "themes": ["theme1", "theme2"],
+    "locations": ["place1", "place2"],
+    "time_periods": ["period1", "period2"],
+    "narrative_techniques": ["technique1", "technique2"]
+}
+
+Be specific and avoid generic terms. Only include elements clearly present in the text."""
+
+# On-disk cache of model responses, so re-running over the same text is cheap
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "literary_sharder")
+
+# Tokens that matter when locating a JSON object in a model response: string
+# literals (skipped whole, so braces inside them don't count) and braces
+JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]')
+
+# Fallback extraction: capitalized (multi-word) names and well-known theme keywords
+NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+THEME_MATCHER = KeywordMatcher(['love', 'death', 'war', 'peace', 'family', 'honor', 'revenge',
+                                'power', 'freedom', 'justice', 'betrayal', 'redemption'])
 
 
 class MstyIntegration:
     """Handles communication with Msty's local AI service."""
 
-    def __init__(self, model_name="llama3.2"):
+    def __init__(self, model_name="llama3.2", max_retries: int = 3):
         self.model_name = model_name
         self.base_url = "http://localhost:10000"  # Default Ollama/Msty endpoint
         self.api_url = f"{self.base_url}/api/generate"
+        self.keep_alive = "10m"  # Keep the model resident between window requests
+
+        # One session for every request so connections to Msty are kept alive and
+        # shared by the discovery threads. Only generate calls are retried (with
+        # backoff); the availability check and warm-up should fail fast.
+        # max_retries counts attempts, so Retry gets one fewer retry than that.
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+        self.session.mount(self.api_url, HTTPAdapter(
+            pool_connections=8, pool_maxsize=8,
+            max_retries=Retry(total=max(max_retries - 1, 0), backoff_factor=1,
+                              status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset({"POST"}), raise_on_status=False)
+        ))
+
         self.available = self._check_availability()
+        if self.available:
+            self._warm_up()
+
+    @staticmethod
+    def _parse_json(response: requests.Response):
+        """Decode a JSON response body, straight from the raw bytes with orjson if available."""
+        return orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
 
     def _check_availability(self) -> bool:
         """Check if Msty/Ollama service is running and model is available."""
         try:
             # Check if service is running
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code != 200:
                 return False
 
             # Check if our model is available
-            models = response.json().get('models', [])
+            models = self._parse_json(response).get('models', [])
             model_names = [model['name'] for model in models]
 
             # Check for exact match or partial match (e.g., llama3.2:latest)
@@ -86,11 +273,21 @@ class MstyIntegration:
             print(f"Available models: {', '.join(model_names)}")
             return False
 
-        except requests.exceptions.RequestException:
+        except (requests.exceptions.RequestException, ValueError):  # ValueError: bad JSON
             return False
 
-    def analyze_text(self, text: str, prompt: str, max_retries: int = 3) -> Optional[str]:
-        """Send text to Msty for analysis with retry logic."""
+    def _warm_up(self):
+        """Load the model ahead of time so the first analysis doesn't pay for it."""
+        try:
+            # An empty prompt just loads the model and pins it for keep_alive. Sent
+            # outside the session so it isn't retried: a slow load shouldn't stall startup.
+            requests.post(self.api_url, json={"model": self.model_name, "prompt": "",
+                                              "keep_alive": self.keep_alive}, timeout=60)
+        except requests.exceptions.RequestException:
+            pass  # Not fatal; the first real request will load the model instead
+
+    def analyze_text(self, text: str, prompt: str) -> Optional[str]:
+        """Send text to Msty for analysis (transient failures are retried by the session)."""
         if not self.available:
             return None
 
@@ -98,25 +295,21 @@ class MstyIntegration:
             "model": self.model_name,
             "prompt": f"{prompt}\n\nText to analyze:\n{text}",
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": 0.3,  # Lower temperature for more consistent analysis
                 "top_p": 0.9
             }
         }
 
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(self.api_url, json=payload, timeout=60)
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get('response', '')
-                else:
-                    print(f"API error: {response.status_code}")
-                    time.sleep(2)
-            except requests.exceptions.RequestException as e:
-                print(f"Request failed (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(5)
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=60)
+            if response.status_code == 200:
+                result = self._parse_json(response)
+                return result.get('response', '')
+            print(f"API error: {response.status_code}")
+        except (requests.exceptions.RequestException, ValueError) as e:  # ValueError: bad JSON
+            print(f"Request failed: {e}")
 
         return None
 
@@ -134,46 +327,102 @@ class LiteraryAnalyzer:
             'narrative_techniques': set()
         }
 
+        # Response cache shared by the discovery threads (None if it can't be opened)
+        self._cache_lock = threading.Lock()
+        self._failed_windows = 0  # Windows Msty gave no answer for in the current discovery run
+        try:
+            os.makedirs(os.path.join(CACHE_DIR, "discovery"), exist_ok=True)
+            self._cache = dbm.open(os.path.join(CACHE_DIR, "responses"), 'c')
+        except Exception:
+            self._cache = None
+
+    def _cached_analysis(self, window: str) -> Optional[str]:
+        """Ask Msty about a window, reusing a cached response for identical requests."""
+        if self._cache is None:
+            return self._count_failure(self.msty.analyze_text(window, ELEMENT_DISCOVERY_PROMPT))
+
+        key = hashlib.sha256(
+            f"{self.msty.model_name}\0{ELEMENT_DISCOVERY_PROMPT}\0{window}".encode('utf-8')).hexdigest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached.decode('utf-8')
+
+        response = self._count_failure(self.msty.analyze_text(window, ELEMENT_DISCOVERY_PROMPT))
+        if response:  # Failures aren't cached so they are retried next run
+            with self._cache_lock:
+                self._cache[key] = response.encode('utf-8')
+        return response
+
+    def _count_failure(self, response: Optional[str]) -> Optional[str]:
+        """Pass a response through, noting it if Msty gave no answer."""
+        if not response:
+            with self._cache_lock:
+                self._failed_windows += 1
+        return response
+
+    def _discovery_cache_path(self, text: str) -> str:
+        """Path of the cached discovery results for this text, model and prompt."""
+        key = hashlib.sha256(
+            f"{self.msty.model_name}\0{ELEMENT_DISCOVERY_PROMPT}\0{text}".encode('utf-8')).hexdigest()
+        return os.path.join(CACHE_DIR, "discovery", f"{key}.json")
+
+    def _load_discovery(self, cache_path: str) -> Optional[Dict[str, List[str]]]:
+        """Read cached discovery results, or None if there are none (or they're unreadable)."""
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+            return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def _store_discovery(self, cache_path: str, elements: Dict[str, Set[str]]):
+        """Write discovery results atomically, so a crash never leaves a partial file."""
+        data = {key: list(values) for key, values in elements.items()}
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode('utf-8'))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Caching is best-effort
+
     def structural_analysis(self, text: str) -> Dict[str, any]:
         """Perform initial structural analysis without AI."""
 
         # Find chapter/section boundaries
-        chapter_patterns = [
-            r'^Chapter\s+\d+',
-            r'^CHAPTER\s+[IVXLC]+',
-            r'^Book\s+\d+',
-            r'^Part\s+\d+',
-            r'^Act\s+[IVXLC]+',
-            r'^Scene\s+[IVXLC]+',
-            r'^\d+\.',
-            r'^[IVXLC]+\.',
-        ]
-
         chapters = []
-        lines = text.split('\n')
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-            for pattern in chapter_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    chapters.append({
-                        'title': line,
-                        'line_number': i,
-                        'pattern': pattern
-                    })
-                    break
-
-        # Extract potential character names (capitalized words that appear frequently)
+        line_number = 0
+        last_pos = 0
+
+        # One sweep over the whole text; line numbers are counted incrementally
+        for match in CHAPTER_RE.finditer(text):
+            line_start = match.start()
+            line_number += text.count('\n', last_pos, line_start)
+            last_pos = line_start
+
+            line_end = text.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(text)
+
+            chapters.append({
+                'title': text[line_start:line_end].strip(),
+                'line_number': line_number,
+                'offset': line_start,  # Character offset of the heading line, for slicing
+                'pattern': CHAPTER_PATTERNS[match.lastindex - 1]
+            })
+
+        # Extract potential character names (capitalized words that appear frequently),
+        # skipping common words as they are matched rather than after the fact
         potential_characters = []
-        words = re.findall(r'\b[A-Z][a-z]{2,}\b', text)
-        word_counts = Counter(words)
-
-        # Filter for names that appear multiple times and aren't common words
-        common_words = {'The', 'And', 'But', 'When', 'Where', 'What', 'Who', 'How', 'Why',
-                        'This', 'That', 'These', 'Those', 'Then', 'Now', 'Here', 'There'}
+        word_counts = Counter(
+            word for word in (match.group() for match in CAPITALIZED_WORD_RE.finditer(text))
+            if word not in COMMON_WORDS
+        )
 
+        # Keep names that appear multiple times
         for word, count in word_counts.items():
-            if count >= 3 and word not in common_words and len(word) >= 3:
+            if count >= 3:
                 potential_characters.append((word, count))
 
         # Sort by frequency
@@ -182,48 +431,46 @@ class LiteraryAnalyzer:
         return {
             'chapters': chapters,
             'total_length': len(text),
-            'paragraph_count': len([p for p in text.split('\n\n') if p.strip()]),
+            'paragraph_count': sum(1 for match in PARAGRAPH_RE.finditer(text) if not match.group().isspace()),
             'potential_characters': potential_characters[:20],  # Top 20 candidates
             'has_dialogue': '"' in text or '"' in text or '"' in text,
-            'estimated_reading_time': len(text.split()) // 250  # ~250 words per minute
+            'estimated_reading_time': sum(1 for _ in WORD_RE.finditer(text)) // 250  # ~250 words per minute
         }
 
     def create_analysis_windows(self, text: str, window_size: int = 3000, overlap: int = 500) -> List[str]:
-        """Create overlapping windows for AI analysis."""
-        windows = []
-        words = text.split()
+        """Create overlapping windows for AI analysis.
 
-        for i in range(0, len(words), window_size - overlap):
-            window_words = words[i:i + window_size]
-            if len(window_words) > 100:  # Skip very small windows
-                windows.append(' '.join(window_words))
+        Windows are slices of the original text spanning ``window_size`` words,
+        found in one pass over word offsets rather than via a list of every word.
+        """
+        windows = []
+        step = window_size - overlap
+        pending = deque()  # (first word index, start offset) of windows still being filled
+        word_count = 0
+        end = 0
+
+        for word_count, match in enumerate(WORD_RE.finditer(text), 1):
+            index = word_count - 1
+            if index % step == 0:
+                pending.append((index, match.start()))
+
+            end = match.end()
+            if pending and word_count - pending[0][0] == window_size:
+                _, start = pending.popleft()
+                if window_size > 100:  # Skip very small windows
+                    windows.append(text[start:end])
+
+        # Windows that run off the end of the text
+        for first, start in pending:
+            if word_count - first > 100:  # Skip very small windows
+                windows.append(text[start:end])
 
         return windows
 
     def analyze_window_for_elements(self, window: str) -> Dict[str, Set[str]]:
         """Analyze a text window to discover literary elements."""
 
-        # Prompt for discovering literary elements
-        prompt = """Analyze this literary text excerpt carefully. Extract and list:
-
-1. CHARACTER NAMES: Any character names mentioned (first names, last names, titles)
-2. THEMES: Major themes, concepts, or ideas explored
-3. LOCATIONS: Places, settings, geographical references
-4. TIME INDICATORS: Historical periods, seasons, times of day
-5. NARRATIVE TECHNIQUES: Point of view, literary devices used
-
-Format your response as a JSON object with these exact keys:
-{
-    "characters": ["name1", "name2"],
-    "themes": ["theme1", "theme2"],
-    "locations": ["place1", "place2"],
-    "time_periods": ["period1", "period2"],
-    "narrative_techniques": ["technique1", "technique2"]
-}
-
-Be specific and avoid generic terms. Only include elements clearly present in the text."""
-
-        response = self.msty.analyze_text(window, prompt)
+        response = self._cached_analysis(window)
 
         if not response:
             return {k: set() for k in self.discovered_elements.keys()}
@@ -231,10 +478,9 @@ Be specific and avoid generic terms. Only include elements clearly present in th
         # Try to parse JSON response
         try:
             # Clean up the response to extract JSON
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                parsed = json.loads(json_str)
+            json_str = self._extract_json(response)
+            if json_str:
+                parsed = orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
 
                 # Convert lists to sets and clean up
                 result = {}
@@ -256,30 +502,62 @@ Be specific and avoid generic terms. Only include elements clearly present in th
 
         return {k: set() for k in self.discovered_elements.keys()}
 
+    def _extract_json(self, response: str) -> Optional[str]:
+        """Return the first brace-balanced {...} object in a response, or None.
+
+        Single linear scan; braces inside JSON strings are ignored.
+        """
+        start = response.find('{')
+        if start == -1:
+            return None
+
+        depth = 0
+        for token in JSON_TOKEN_RE.finditer(response, start):
+            brace = token.group()
+            if brace == '{':
+                depth += 1
+            elif brace == '}':
+                depth -= 1
+                if depth == 0:
+                    return response[start:token.end()]
+
+        return None  # Unbalanced (e.g. truncated) response
+
     def _fallback_extraction(self, response: str) -> Dict[str, Set[str]]:
         """Fallback method to extract elements when JSON parsing fails."""
         result = {k: set() for k in self.discovered_elements.keys()}
 
         # Try to find character names (capitalized words)
-        chars = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', response)
+        chars = NAME_RE.findall(response)
         result['characters'] = set(chars[:10])  # Limit to avoid noise
 
         # Look for theme keywords
-        theme_keywords = ['love', 'death', 'war', 'peace', 'family', 'honor', 'revenge',
-                          'power', 'freedom', 'justice', 'betrayal', 'redemption']
-        for keyword in theme_keywords:
-            if keyword.lower() in response.lower():
-                result['themes'].add(keyword)
+        result['themes'] = THEME_MATCHER.find(response.lower())
 
         return result
 
-    def progressive_discovery(self, text: str, max_windows: int = 10) -> Dict[str, Set[str]]:
-        """Progressively discover elements using sliding window analysis."""
+    def progressive_discovery(self, text: str, max_windows: int = 10,
+                              max_concurrency: int = 4) -> Dict[str, Set[str]]:
+        """Progressively discover elements using sliding window analysis.
+
+        Windows are sent to Msty concurrently, at most ``max_concurrency`` at a
+        time (match this to Ollama's ``OLLAMA_NUM_PARALLEL``).
+        """
 
         if not self.msty.available:
             print("Msty not available. Using structural analysis only.")
             return {k: set() for k in self.discovered_elements.keys()}
 
+        # Whole-text results from an earlier run skip windowing and Msty entirely
+        cache_path = self._discovery_cache_path(text)
+        cached = self._load_discovery(cache_path)
+        if cached is not None:
+            print("Using cached discovery results.")
+            for key, values in cached.items():
+                if key in self.discovered_elements:
+                    self.discovered_elements[key].update(values)
+            return self._filter_and_rank_elements()
+
         windows = self.create_analysis_windows(text)
 
         # Limit the number of windows to analyze for efficiency
@@ -302,32 +580,50 @@ Be specific and avoid generic terms. Only include elements clearly present in th
 
         print(f"Analyzing {len(windows)} text windows with Llama 3.2...")
 
-        # Progress tracking
-        if RICH_AVAILABLE:
-            with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-                task = progress.add_task("Discovering literary elements...", total=len(windows))
-
-                for i, window in enumerate(windows):
-                    progress.update(task, description=f"Analyzing window {i + 1}/{len(windows)}")
-                    elements = self.analyze_window_for_elements(window)
+        # Dispatch all windows at once; the pool bounds how many are in flight
+        results = [None] * len(windows)
+        self._failed_windows = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = {executor.submit(self.analyze_window_for_elements, window): i
+                       for i, window in enumerate(windows)}
+
+            # Progress tracking
+            if RICH_AVAILABLE:
+                rich = _get_rich()
+                # Windows finish seconds apart, so a slow refresh keeps redraws off the GIL
+                with rich.Progress(rich.SpinnerColumn(),
+                                   rich.TextColumn("[progress.description]{task.description}"),
+                                   refresh_per_second=2) as progress:
+                    task = progress.add_task("Discovering literary elements...", total=len(windows))
+
+                    for done, future in enumerate(as_completed(futures), 1):
+                        results[futures[future]] = future.result()
+                        progress.update(task, description=f"Analyzed window {done}/{len(windows)}")
+                        progress.advance(task)
+            else:
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    print(f"Analyzed window {done}/{len(windows)}...")
 
-                    # Merge discovered elements
-                    for key, values in elements.items():
-                        self.discovered_elements[key].update(values)
+        # Merge discovered elements in window order so results are reproducible
+        found = {k: set() for k in self.discovered_elements.keys()}
+        for elements in results:
+            for key, values in elements.items():
+                found[key].update(values)
+                self.discovered_elements[key].update(values)
 
-                    progress.advance(task)
-        else:
-            for i, window in enumerate(windows):
-                print(f"Analyzing window {i + 1}/{len(windows)}...")
-                elements = self.analyze_window_for_elements(window)
-
-                # Merge discovered elements
-                for key, values in elements.items():
-                    self.discovered_elements[key].update(values)
+        if not self._failed_windows:  # Only complete runs are cached
+            self._store_discovery(cache_path, found)
 
         # Filter and rank discovered elements
         return self._filter_and_rank_elements()
 
+    def _has_only_name_chars(self, name: str) -> bool:
+        """True if name is made only of ASCII letters, whitespace, hyphens, apostrophes and dots."""
+        # Delete the allowed non-space characters; only whitespace may remain
+        rest = name.translate(NAME_CHARS_DELETE_TABLE)
+        return not rest or rest.isspace()
+
     def _filter_and_rank_elements(self) -> Dict[str, Set[str]]:
         """Filter out noise and rank discovered elements by relevance."""
         filtered = {}
@@ -340,7 +636,7 @@ Be specific and avoid generic terms. Only include elements clearly present in th
             if (len(char) >= 2 and
                     char not in common_words and
                     not char.isdigit() and
-                    re.match(r'^[A-Za-z\s\-\'\.]+$', char)):
+                    self._has_only_name_chars(char)):
                 filtered_chars.add(char)
 
         filtered['characters'] = filtered_chars
@@ -356,6 +652,56 @@ Be specific and avoid generic terms. Only include elements clearly present in th
         return filtered
 
 
+def _json_default(obj):
+    """Serialize the non-JSON types that can end up in the index (sets, datetimes)."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _build_element_scan(discovered_elements: Dict[str, Set[str]]
+                        ) -> Tuple[KeywordMatcher, Dict[str, List[Tuple[str, str]]]]:
+    """Build what _scan_shard_content needs to look for the discovered elements."""
+    # One matcher over every discovered element, whatever its type
+    matcher = KeywordMatcher(element for elements in discovered_elements.values() for element in elements)
+    element_keys = {element_type: [(element, element.lower()) for element in elements]
+                    for element_type, elements in discovered_elements.items()}
+    return matcher, element_keys
+
+
+def _scan_shard_content(content: str, matcher: KeywordMatcher,
+                        element_keys: Dict[str, List[Tuple[str, str]]]) -> Tuple[Dict[str, List[str]], str]:
+    """Find which discovered elements appear in a shard's file content and build its preview."""
+    # Skip header lines
+    content_lines = content.split('\n')
+    content_text = '\n'.join(line for line in content_lines if not line.startswith('#'))
+
+    # Find which elements appear in this shard
+    shard_elements = {
+        'characters': [],
+        'themes': [],
+        'locations': [],
+        'time_periods': [],
+        'narrative_techniques': []
+    }
+
+    found = matcher.find(content_text.lower())
+    for element_type, keys in element_keys.items():
+        shard_elements[element_type] = [element for element, key in keys if key in found]
+
+    preview = content_text[:200] + "..." if len(content_text) > 200 else content_text
+    return shard_elements, preview
+
+
+def _scan_shard(shard_path: str, matcher: KeywordMatcher,
+                element_keys: Dict[str, List[Tuple[str, str]]]) -> Tuple[Dict[str, List[str]], str]:
+    """Scan a saved shard file; module-level so it can run in a worker process."""
+    with open(shard_path, 'r', encoding='utf-8') as f:
+        return _scan_shard_content(f.read(), matcher, element_keys)
+
+
 class LiterarySharder:
     """Main class for creating intelligent literary text shards."""
 
@@ -365,22 +711,39 @@ class LiterarySharder:
         self.current_output_dir = None
         self.shard_manifest = {}  # Track saved shards
 
+        # Shard files are written in the background while the next shard is prepared
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self._pending_writes = {}  # shard_path -> Future
+
+        # Index entries computed as shards are saved, so the index needn't re-read them
+        self._index_scan = None  # (discovered_elements, matcher, element_keys)
+        self._index_entries = {}  # shard filename -> (elements_present, preview)
+
     def load_text_file(self, file_path: str) -> str:
         """Load and clean text file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-
-            # Basic cleaning
-            text = re.sub(r'\r\n', '\n', text)  # Normalize line endings
-            text = re.sub(r'\n{3,}', '\n\n', text)  # Reduce excessive line breaks
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ''  # mmap can't map an empty file
+
+                # Decode straight out of the mapping, without an intermediate bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):  # Not on Windows
+                        mm.madvise(mmap.MADV_SEQUENTIAL)  # Decoding reads front to back; read ahead
+                    text = str(mm, 'utf-8')
+
+            # Basic cleaning, only when there is something to clean
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')  # Normalize line endings
+            if '\n\n\n' in text:
+                text = EXCESS_NEWLINES_RE.sub('\n\n', text)  # Reduce excessive line breaks
 
             return text
         except Exception as e:
             raise Exception(f"Error loading file: {e}")
 
     def _save_shard_to_disk(self, shard_name: str, shard_content: List[str], source_filename: str) -> str:
-        """Save a single shard to disk immediately."""
+        """Queue a single shard for writing and record it in the manifest."""
         if not self.current_output_dir:
             raise Exception("Output directory not initialized")
 
@@ -388,12 +751,23 @@ class LiterarySharder:
         shard_filename = f"{self._sanitize_name(shard_name)}.txt"
         shard_path = os.path.join(self.current_output_dir, shard_filename)
 
-        # Write shard content
-        with open(shard_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Literary Shard: {shard_name}\n")
-            f.write(f"# Source: {source_filename}\n")
-            f.write(f"# Created: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write('\n\n'.join(shard_content))
+        # Write shard content in the background; a later shard with the same name
+        # must still overwrite an earlier one, so wait for any pending write first
+        header = (f"# Literary Shard: {shard_name}\n"
+                  f"# Source: {source_filename}\n"
+                  f"# Created: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        previous = self._pending_writes.get(shard_path)
+        if previous is not None:
+            previous.result()
+        self._pending_writes[shard_path] = self._io_pool.submit(
+            self._write_shard_file, shard_path, header, shard_content)
+
+        # Index the shard now, while its content is in memory (keyed by file, so a
+        # later shard overwriting the same file replaces the entry too)
+        if self._index_scan is not None:
+            _, matcher, element_keys = self._index_scan
+            self._index_entries[shard_filename] = _scan_shard_content(
+                header + '\n\n'.join(shard_content), matcher, element_keys)
 
         # Track in manifest
         content_text = '\n'.join(shard_content)
@@ -406,13 +780,46 @@ class LiterarySharder:
 
         return shard_path
 
+    def _prepare_index(self, discovered_elements: Dict[str, Set[str]]):
+        """Index shards for these elements as they are saved (see create_enhanced_index)."""
+        self._index_scan = (discovered_elements, *_build_element_scan(discovered_elements))
+        self._index_entries = {}
+
+    @staticmethod
+    def _write_shard_file(shard_path: str, header: str, shard_content: List[str]):
+        """Write one shard file (runs on the I/O pool) with a single write call."""
+        with open(shard_path, 'w', encoding='utf-8') as f:
+            f.write(header + '\n\n'.join(shard_content))
+
+    def _wait_for_writes(self):
+        """Block until all queued shard writes are on disk, re-raising any write error."""
+        pending = list(self._pending_writes.values())
+        self._pending_writes = {}
+        for future in pending:
+            future.result()
+
+    def _iter_paragraphs(self, text: str) -> Iterator[str]:
+        """Yield the stripped, non-empty paragraphs of text (blocks separated by blank lines)."""
+        for match in PARAGRAPH_RE.finditer(text):
+            paragraph = match.group().strip()
+            if paragraph:
+                yield paragraph
+
+    def _iter_sections(self, text: str) -> Iterator[str]:
+        """Yield the raw sections between SECTION_BREAK_RE matches (a lazy re.split)."""
+        start = 0
+        for match in SECTION_BREAK_RE.finditer(text):
+            yield text[start:match.start()]
+            start = match.end()
+        yield text[start:]
+
     def create_character_based_shards(self, text: str, characters: Set[str], max_size: int, source_filename: str) -> \
     Dict[str, Dict]:
         """Create shards based on character appearances, writing directly to disk per shard key to minimize RAM."""
 
         shard_info = {}
 
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        paragraphs = self._iter_paragraphs(text)  # Lazily, one paragraph at a time
 
         # Track open shard files and sizes per shard key
         open_shards = {}  # shard_key -> {'file_handle': f, 'current_size': int, 'shard_count': int}
@@ -423,16 +830,21 @@ class LiterarySharder:
             safe_name = self._sanitize_name(shard_name)
             shard_path = os.path.join(self.current_output_dir, f"{safe_name}.txt")
 
+            header = (f"# Literary Shard: {shard_name}\n"
+                      f"# Source: {source_filename}\n"
+                      f"# Created: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
             # Open file for writing (overwrite if exists)
             f = open(shard_path, 'w', encoding='utf-8')
-            f.write(f"# Literary Shard: {shard_name}\n")
-            f.write(f"# Source: {source_filename}\n")
-            f.write(f"# Created: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(header)
 
             open_shards[shard_key] = {
                 'file_handle': f,
                 'current_size': 0,
-                'shard_count': count
+                'shard_count': count,
+                # Running totals for the manifest, so the file never has to be re-read
+                'char_count': len(header),
+                'word_count': len(header.split())
             }
             return f, shard_path, shard_name
 
@@ -446,28 +858,23 @@ class LiterarySharder:
 
             # Update manifest info
             shard_path = f.name
-            with open(shard_path, 'r', encoding='utf-8') as file_check:
-                content_text = file_check.read()
-            word_count = len(content_text.split())
-            char_count = len(content_text)
-
             shard_name = f"{shard_key}_{shard['shard_count']}"
             shard_info[shard_name] = {
                 'filename': os.path.basename(shard_path),
-                'word_count': word_count,
-                'character_count': char_count,
+                'word_count': shard['word_count'],
+                'character_count': shard['char_count'],
                 'saved_at': datetime.datetime.now().isoformat()
             }
 
             # Remove from open shards
             del open_shards[shard_key]
 
+        # Match all characters against each paragraph in one pass
+        matcher = KeywordMatcher(characters)
+
         for paragraph in paragraphs:
-            # Identify characters in paragraph
-            paragraph_chars = []
-            for char in characters:
-                if char.lower() in paragraph.lower():
-                    paragraph_chars.append(char)
+            # Identify the first two characters in paragraph (in the order of `characters`)
+            paragraph_chars = matcher.matches(paragraph.lower(), limit=2)
 
             if paragraph_chars:
                 shard_key = f"characters_{'_'.join(sorted(paragraph_chars[:2]))}"
@@ -501,6 +908,8 @@ class LiterarySharder:
             # Write paragraph and add size
             f.write(paragraph + "\n\n")
             shard['current_size'] += para_size
+            shard['char_count'] += para_size + 2
+            shard['word_count'] += len(paragraph.split())
 
         # Close all remaining open shards at the end
         keys_to_close = list(open_shards.keys())
@@ -515,15 +924,15 @@ class LiterarySharder:
         shard_info = {}
 
         # Split text into sections (by double line break or chapter markers)
-        sections = re.split(r'\n\s*\n|\n(?=Chapter|\nBook|\nPart)', text)
-        sections = [s.strip() for s in sections if s.strip()]
+        sections = (section.strip() for section in self._iter_sections(text))
+        sections = (section for section in sections if section)
+
+        # Lowercase the themes once, not once per section
+        matcher = KeywordMatcher(themes)
 
         for i, section in enumerate(sections):
-            # Find themes present in this section
-            section_themes = []
-            for theme in themes:
-                if theme.lower() in section.lower():
-                    section_themes.append(theme)
+            # Find the first theme present in this section (lowercasing it only once)
+            section_themes = matcher.matches(section.lower(), limit=1)
 
             # Group by primary theme or create general sections
             if section_themes:
@@ -534,8 +943,7 @@ class LiterarySharder:
 
             # Split large sections
             if len(section) > max_size:
-                chunks = [section[i:i + max_size] for i in range(0, len(section), max_size)]
-                for j, chunk in enumerate(chunks):
+                for j, chunk in enumerate(self._iter_chunks(section, max_size)):
                     shard_name = f"{shard_key}_part_{j + 1}"
                     self._save_shard_to_disk(shard_name, [chunk], source_filename)
                     shard_info[shard_name] = self.shard_manifest[shard_name]
@@ -543,6 +951,7 @@ class LiterarySharder:
                 self._save_shard_to_disk(shard_key, [section], source_filename)
                 shard_info[shard_key] = self.shard_manifest[shard_key]
 
+        self._wait_for_writes()
         return shard_info
 
     def create_structural_shards(self, text: str, structure: Dict, max_size: int, source_filename: str) -> Dict[
@@ -551,47 +960,50 @@ class LiterarySharder:
         shard_info = {}
 
         if structure['chapters']:
-            # Split by chapters
-            lines = text.split('\n')
-            current_chapter = []
+            # Split by chapters: slice the text between heading lines rather than
+            # checking every line against every chapter
+            titles, offsets = {}, {}
+            for chapter in structure['chapters']:
+                if chapter['line_number'] not in titles:  # First match per line wins
+                    titles[chapter['line_number']] = chapter['title']
+                    offsets[chapter['line_number']] = chapter.get('offset')
+            line_count = text.count('\n') + 1
+            heading_lines = sorted(line_num for line_num, title in titles.items()
+                                   if title and 0 <= line_num < line_count)
+
+            # structural_analysis already recorded where each heading starts; only
+            # structures without offsets need the newlines walked again
+            starts = [offsets[line_num] for line_num in heading_lines]
+            if None in starts:
+                starts = self._line_starts(text, heading_lines)
+
+            current_start = 0
             current_chapter_name = "prologue"
 
-            for line_num, line in enumerate(lines):
-                # Check if this line starts a new chapter
-                new_chapter = None
-                for chapter in structure['chapters']:
-                    if chapter['line_number'] == line_num:
-                        new_chapter = chapter['title']
-                        break
-
-                if new_chapter:
-                    # Save previous chapter
-                    if current_chapter:
-                        chapter_text = '\n'.join(current_chapter)
-                        if len(chapter_text) > max_size:
-                            # Split large chapters
-                            chunks = [chapter_text[i:i + max_size] for i in range(0, len(chapter_text), max_size)]
-                            for i, chunk in enumerate(chunks):
-                                shard_name = f"{self._sanitize_name(current_chapter_name)}_part_{i + 1}"
-                                self._save_shard_to_disk(shard_name, [chunk], source_filename)
-                                shard_info[shard_name] = self.shard_manifest[shard_name]
-                        else:
-                            shard_name = self._sanitize_name(current_chapter_name)
-                            self._save_shard_to_disk(shard_name, [chapter_text], source_filename)
+            for line_num, start in zip(heading_lines, starts):
+                # Save previous chapter (there is none before a heading on the first line)
+                if line_num > 0:
+                    chapter_text = text[current_start:start - 1]  # Without the newline before the heading
+                    if len(chapter_text) > max_size:
+                        # Split large chapters
+                        for i, chunk in enumerate(self._iter_chunks(chapter_text, max_size)):
+                            shard_name = f"{self._sanitize_name(current_chapter_name)}_part_{i + 1}"
+                            self._save_shard_to_disk(shard_name, [chunk], source_filename)
                             shard_info[shard_name] = self.shard_manifest[shard_name]
+                    else:
+                        shard_name = self._sanitize_name(current_chapter_name)
+                        self._save_shard_to_disk(shard_name, [chapter_text], source_filename)
+                        shard_info[shard_name] = self.shard_manifest[shard_name]
 
-                    # Start new chapter
-                    current_chapter = [line]
-                    current_chapter_name = new_chapter
-                else:
-                    current_chapter.append(line)
+                # Start new chapter
+                current_start = start
+                current_chapter_name = titles[line_num]
 
             # Add final chapter
-            if current_chapter:
-                chapter_text = '\n'.join(current_chapter)
-                shard_name = self._sanitize_name(current_chapter_name)
-                self._save_shard_to_disk(shard_name, [chapter_text], source_filename)
-                shard_info[shard_name] = self.shard_manifest[shard_name]
+            chapter_text = text[current_start:]
+            shard_name = self._sanitize_name(current_chapter_name)
+            self._save_shard_to_disk(shard_name, [chapter_text], source_filename)
+            shard_info[shard_name] = self.shard_manifest[shard_name]
         else:
             # No clear chapters, split by size
             sections = self._split_by_size(text, max_size)
@@ -600,11 +1012,30 @@ class LiterarySharder:
                 self._save_shard_to_disk(shard_name, [section], source_filename)
                 shard_info[shard_name] = self.shard_manifest[shard_name]
 
+        self._wait_for_writes()
         return shard_info
 
+    def _line_starts(self, text: str, line_numbers: List[int]) -> List[int]:
+        """Offsets at which the given (ascending, in-range) line numbers start."""
+        starts = []
+        newlines = NEWLINE_RE.finditer(text)
+        line, pos = 0, 0
+        for line_num in line_numbers:
+            if line_num > line:
+                # Skip ahead to the newline that ends the previous line
+                pos = next(islice(newlines, line_num - line - 1, None)).end()
+                line = line_num
+            starts.append(pos)
+        return starts
+
     def _sanitize_name(self, name: str) -> str:
         """Convert a string to a valid filename."""
-        return re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')[:50]
+        return UNSAFE_NAME_CHARS_RE.sub('', name).strip().replace(' ', '_')[:50]
+
+    def _iter_chunks(self, text: str, max_size: int) -> Iterator[str]:
+        """Yield fixed-size slices of text one at a time, so only one chunk is alive at once."""
+        for start in range(0, len(text), max_size):
+            yield text[start:start + max_size]
 
     def _split_by_size(self, text: str, max_size: int) -> List[str]:
         """Split text into chunks of approximately max_size."""
@@ -632,37 +1063,38 @@ class LiterarySharder:
                               source_filename: str) -> Dict:
         """Create comprehensive index of all shards and their content."""
 
-        # Read shards back from disk to analyze elements
         shards_with_elements = {}
 
-        for shard_name, shard_info in self.shard_manifest.items():
-            shard_path = os.path.join(self.current_output_dir, shard_info['filename'])
-
-            with open(shard_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Skip header lines
-            content_lines = content.split('\n')
-            content_text = '\n'.join(line for line in content_lines if not line.startswith('#'))
-
-            # Find which elements appear in this shard
-            shard_elements = {
-                'characters': [],
-                'themes': [],
-                'locations': [],
-                'time_periods': [],
-                'narrative_techniques': []
-            }
+        # Shards saved after _prepare_index(discovered_elements) were already scanned;
+        # read the rest back from disk to analyze elements
+        entries = {}
+        if self._index_scan is not None and self._index_scan[0] is discovered_elements:
+            entries = self._index_entries
+        filenames = [shard_info['filename'] for shard_info in self.shard_manifest.values()]
+        missing = [filename for filename in dict.fromkeys(filenames) if filename not in entries]
+
+        if missing:
+            matcher, element_keys = _build_element_scan(discovered_elements)
+            shard_paths = [os.path.join(self.current_output_dir, filename) for filename in missing]
+            scan = partial(_scan_shard, matcher=matcher, element_keys=element_keys)
+
+            # Scanning is CPU-bound string work, so spread many shards over processes;
+            # for a handful, process start-up would cost more than it saves
+            if len(shard_paths) >= INDEX_PARALLEL_MIN_SHARDS:
+                with ProcessPoolExecutor() as executor:
+                    chunksize = max(1, len(shard_paths) // (4 * (os.cpu_count() or 1)))
+                    scanned = list(executor.map(scan, shard_paths, chunksize=chunksize))
+            else:
+                scanned = [scan(shard_path) for shard_path in shard_paths]
+            entries = {**entries, **dict(zip(missing, scanned))}
 
-            for element_type, elements in discovered_elements.items():
-                for element in elements:
-                    if element.lower() in content_text.lower():
-                        shard_elements[element_type].append(element)
+        results = [entries[filename] for filename in filenames]
 
+        for (shard_name, shard_info), (shard_elements, preview) in zip(self.shard_manifest.items(), results):
             shards_with_elements[shard_name] = {
                 **shard_info,
                 "elements_present": shard_elements,
-                "preview": content_text[:200] + "..." if len(content_text) > 200 else content_text
+                "preview": preview
             }
 
         index = {
@@ -684,8 +1116,13 @@ class LiterarySharder:
 
         # Save index
         index_path = os.path.join(self.current_output_dir, "literary_index.json")
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(index_path, 'wb') as f:
+                f.write(orjson.dumps(index, default=_json_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2, ensure_ascii=False, default=_json_default)
 
         # Create README
         self._create_readme(len(self.shard_manifest), source_filename, index["discovered_elements"])
@@ -757,15 +1194,24 @@ Created with Literary Text Sharder v1.1 using Msty + Llama 3.2
 
         # Reset shard manifest
         self.shard_manifest = {}
+        self._index_scan = None
 
         print(f"Loading literary work: {file_path}")
         text = self.load_text_file(file_path)
 
-        print("Performing structural analysis...")
-        structure = self.analyzer.structural_analysis(text)
+        # AI discovery mostly waits on Msty, so run the (CPU-bound) structural
+        # analysis while it is in flight instead of before it
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            print("Discovering literary elements with AI...")
+            discovery = executor.submit(self.analyzer.progressive_discovery, text)
 
-        print("Discovering literary elements with AI...")
-        discovered_elements = self.analyzer.progressive_discovery(text)
+            print("Performing structural analysis...")
+            structure = self.analyzer.structural_analysis(text)
+
+            discovered_elements = discovery.result()
+
+        # Shards are indexed for these elements as they are written
+        self._prepare_index(discovered_elements)
 
         # Choose sharding strategy
         if strategy == "auto":
@@ -805,6 +1251,9 @@ def display_rich_interface():
     if not RICH_AVAILABLE:
         return False
 
+    rich = _get_rich()
+    console, Panel, Table, Prompt = rich.console, rich.Panel, rich.Table, rich.Prompt
+
     console.print(Panel(
         "Intelligent Literary Text Sharder\n\n"
         "Break down large literary works into smart, analyzable shards using AI-discovered "
@@ -864,7 +1313,7 @@ def display_rich_interface():
 
     # Process the file
     try:
-        with console.status("[bold green]Processing literary work..."):
+        with console.status("[bold green]Processing literary work...", spinner="dots", refresh_per_second=2):
             result_path = sharder.process_literary_work(file_path, strategy, max_size, output_dir)
 
         console.print(f"\n[bold green]✅ Success![/] Shards created in:")
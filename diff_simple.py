@@ -1,43 +1,63 @@
 #!/usr/bin/env python3
-import sys, ast, subprocess, csv
-from collections import Counter
+import sys, ast, subprocess, csv, re, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 def run(cmd):
-    p = subprocess.run(cmd, shell=True, text=True, capture_output=True)
+    p = subprocess.run(cmd, text=True, capture_output=True)
     if p.returncode:
-        sys.exit(f"Error running `{cmd}`:\n{p.stderr}")
+        sys.exit(f"Error running `{' '.join(cmd)}`:\n{p.stderr}")
     return p.stdout
 
 def load_version(branch, path):
-    return run(f"git show {branch}:{path}")
+    return run(["git", "show", f"{branch}:{path}"])
+
+def body_hash(node, lines):
+    # hash the raw source bytes of the body, skipping a leading docstring
+    body = node.body
+    if isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+        body = body[1:]
+    if not body:
+        return hashlib.blake2b(b"", digest_size=8).digest()
+    first, end = body[0], getattr(node, "end_lineno", node.lineno)
+    chunk = [lines[first.lineno-1][first.col_offset:]] + lines[first.lineno:end]
+    return hashlib.blake2b(b"".join(chunk), digest_size=8).digest()
 
 def extract_defs(src):
     tree = ast.parse(src)
-    defs = {}
-    class V(ast.NodeVisitor):
-        def visit_FunctionDef(self, node):
-            # collect name, start, end, body
-            start, end = node.lineno, getattr(node, "end_lineno", node.lineno)
-            body_lines = []
-            for s in node.body:
-                if isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant) and isinstance(s.value.value, str):
-                    continue
-                try:
-                    body_lines.append(ast.unparse(s).strip())
-                except:
-                    pass
-            code = "\n".join(body_lines)
-            defs[node.name] = (start, end, code)
-            self.generic_visit(node)
-        def visit_ClassDef(self, node):
-            self.generic_visit(node)
-    V().visit(tree)
-    return defs
+    lines = src.encode().splitlines(keepends=True)
+    # source order, so a later def of the same name wins as before
+    nodes = sorted((n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))),
+                   key=lambda n: (n.lineno, n.col_offset))
+    return {n.name: (n.lineno, getattr(n, "end_lineno", n.lineno), body_hash(n, lines)) for n in nodes}
+
+SHA_LINE = re.compile(r"^([0-9a-f]{40,64}) \d+ (\d+)")
+
+@lru_cache(maxsize=None)
+def load_blame(branch, path):
+    # one porcelain blame per (branch, path): commit per final line, author per commit
+    out = run(["git", "blame", branch, "--porcelain", "--", path])
+    line_commits, authors = {}, {}
+    sha = None
+    for L in out.split("\n"):
+        m = SHA_LINE.match(L)
+        if m:
+            sha = m.group(1)
+            line_commits[int(m.group(2))] = sha
+        elif L.startswith("author ") and sha not in authors:
+            authors[sha] = L.split(" ",1)[1]
+    return line_commits, authors
 
 def blame_author(branch, path, a, b):
-    out = run(f"git blame {branch} -L{a},{b} --porcelain -- {path}")
-    authors = [L.split(" ",1)[1] for L in out.splitlines() if L.startswith("author ")]
-    return Counter(authors).most_common(1)[0][0] if authors else "UNKNOWN"
+    line_commits, authors = load_blame(branch, path)
+    # porcelain names each commit once, so count distinct commits in first-seen order
+    commits = dict.fromkeys(line_commits[n] for n in range(a, b+1) if n in line_commits)
+    counts = {}
+    for c in commits:
+        if c in authors:
+            counts[authors[c]] = counts.get(authors[c], 0) + 1
+    # max() keeps the first author to appear among ties, as most_common did
+    return max(counts, key=counts.get) if counts else "UNKNOWN"
 
 if __name__=="__main__":
     if len(sys.argv)!=4:
@@ -45,11 +65,11 @@ if __name__=="__main__":
 
     path, old, new = sys.argv[1], sys.argv[2], sys.argv[3]
 
-    old_src = load_version(old, path)
-    new_src = load_version(new, path)
-
-    old_defs = extract_defs(old_src)
-    new_defs = extract_defs(new_src)
+    # load and parse both versions side by side
+    with ThreadPoolExecutor(2) as ex:
+        old_f = ex.submit(lambda: extract_defs(load_version(old, path)))
+        new_f = ex.submit(lambda: extract_defs(load_version(new, path)))
+        old_defs, new_defs = old_f.result(), new_f.result()
 
     added   = set(new_defs) - set(old_defs)
     removed = set(old_defs) - set(new_defs)
@@ -60,22 +80,14 @@ if __name__=="__main__":
     with open("function_changes.csv", "w", newline="") as f1:
         writer = csv.writer(f1)
         writer.writerow(["function", "status", "author"])
-        for fn in sorted(added):
-            a, b, _ = new_defs[fn]
-            author = blame_author(new, path, a, b)
-            writer.writerow([fn, "new", author])
-        for fn in sorted(updated):
-            a, b, _ = new_defs[fn]
-            author = blame_author(new, path, a, b)
-            writer.writerow([fn, "updated", author])
+        writer.writerows(
+            [(fn, "new", blame_author(new, path, *new_defs[fn][:2])) for fn in sorted(added)] +
+            [(fn, "updated", blame_author(new, path, *new_defs[fn][:2])) for fn in sorted(updated)])
 
     # removed_functions.csv (removed only)
     with open("removed_functions.csv", "w", newline="") as f2:
         writer = csv.writer(f2)
         writer.writerow(["function", "author"])
-        for fn in sorted(removed):
-            a, b, _ = old_defs[fn]
-            author = blame_author(old, path, a, b)
-            writer.writerow([fn, author])
+        writer.writerows((fn, blame_author(old, path, *old_defs[fn][:2])) for fn in sorted(removed))
 
     print("✅ Wrote function_changes.csv and removed_functions.csv")
@@ -64,6 +64,8 @@ Requirements:
 ------------
 * Python 3.9+
 * Rich library (optional, will be installed if user agrees)
+* orjson (optional, faster index writing)
+* re2 (optional, linear-time C++ method matching)
 
 Author: Enhanced for multi-language support
 """
@@ -76,8 +78,13 @@ import subprocess
 import textwrap
 import datetime
 import json
+from bisect import bisect_left
 from collections import defaultdict
-from typing import List, Dict, Tuple, Set, Optional, Union, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import accumulate
+from operator import itemgetter
+from typing import List, Dict, Tuple, Set, Optional, Union, Any, Callable
 from abc import ABC, abstractmethod
 from pathlib import Path
 
@@ -100,6 +107,22 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
+# Try to import orjson for faster index writing (optional)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# RE2 (optional) matches in linear time, which keeps the C++ method pattern safe on long lines
+try:
+    import re2
+
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 # Language detection and file type mappings
 SUPPORTED_LANGUAGES = {
     'python': {
@@ -114,6 +137,60 @@ SUPPORTED_LANGUAGES = {
     }
 }
 
+# Top-level Python statements that are always copied into every shard
+# (ast.TypeAlias only exists from Python 3.12)
+PY_GLOBAL_NODES = (ast.Import, ast.ImportFrom, ast.AnnAssign) + ((ast.TypeAlias,) if hasattr(ast, 'TypeAlias') else ())
+
+# Line boundaries str.splitlines() honours besides '\n' (which need the slow join path)
+OTHER_LINE_BREAK_RE = re.compile('[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Precompiled patterns for C++ element detection
+CPP_NAMESPACE_RE = re.compile(r'^\s*namespace\s+(\w+)\s*\{')
+CPP_CLASS_RE = re.compile(r'^\s*(class|struct)\s+(\w+)(?:\s*:\s*[^{]*)?(?:\s*\{)?')
+CPP_FUNCTION_RE = re.compile(
+    r'^\s*(?:(?:static|inline|virtual|explicit|constexpr)\s+)*(?:\w+(?:\s*\*|\s*&)?(?:\s*::\s*\w+)*\s+)+(\w+)'
+    r'\s*\([^)]*\)(?:\s*const)?(?:\s*override)?(?:\s*final)?(?:\s*noexcept)?(?:\s*\{|;)')
+# All three checks in one match: each optional lookahead records its own groups
+# (1: namespace name, 2-3: class kind and name, 4: function name)
+CPP_ELEMENT_RE = re.compile(''.join(f'(?:(?={pattern.pattern}))?'
+                                    for pattern in (CPP_NAMESPACE_RE, CPP_CLASS_RE, CPP_FUNCTION_RE)))
+CPP_TEMPLATE_RE = re.compile(r'^\s*template\s*<[^>]*>\s*')
+CPP_TEMPLATE_CLASS_RE = re.compile(r'(?:class|struct)\s+(\w+)')
+CPP_TEMPLATE_FUNCTION_RE = re.compile(r'(\w+)\s*\(')
+CPP_GLOBAL_RE = re.compile(r'^\s*(const|static|extern)\s+')
+CPP_CONST_RE = re.compile(r'^\s*(?:const|static|extern)\s+.*?(\w+)(?:\s*=.*?)?;')
+CPP_METHOD_RE = re.compile(
+    r'^\s*(?:(?:public|private|protected):\s*)?(?:(?:static|virtual|inline|explicit|constexpr)\s+)*'
+    r'(?:\w+(?:\s*\*|\s*&)?(?:\s*::\s*\w+)*\s+)*(\w+)\s*\([^)]*\)'
+    r'(?:\s*const)?(?:\s*override)?(?:\s*final)?(?:\s*noexcept)?(?:\s*\{|;)')
+# RE2's \s and \w are ASCII-only, so this copy is only used on text where they agree with re's
+CPP_METHOD_RE2 = re2.compile(CPP_METHOD_RE.pattern) if RE2_AVAILABLE else None
+CPP_PARAM_LIST_RE = re.compile(r'\(([^)]*)\)')
+CPP_DEFAULT_VALUE_RE = re.compile(r'\s*=\s*[^,]*$')
+CPP_RETURN_TYPE_RE = re.compile(r'^\s*(?:(?:static|inline|virtual|explicit|constexpr)\s+)*(.*?)\s+(\w+)\s*\(')
+CPP_ACCESS_SPECIFIER_RE = re.compile(r'^(?:public|private|protected)\s*:\s*')
+CPP_COMMENT_RE = re.compile(r'//.*?$|/\*.*?\*/', re.MULTILINE | re.DOTALL)
+
+# Precompiled patterns for name-based clustering and filenames
+CAMEL_PREFIX_RE = re.compile(r'^([a-z]+[A-Z][a-z]*)')
+PASCAL_PREFIX_RE = re.compile(r'^([A-Z][a-z]+)')
+NON_WORD_RE = re.compile(r'[^\w]')
+# The same replacement as NON_WORD_RE.sub('_', ...) for ASCII text
+SANITIZE_TABLE = str.maketrans({c: '_' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')})
+
+# Sort key for elements in source order
+LINENO_KEY = itemgetter('lineno')
+
+# Keywords to look for in docstrings/comments, in priority order
+DOCSTRING_KEYWORDS = (
+    'create', 'update', 'delete', 'get', 'list', 'find', 'search',
+    'validate', 'process', 'handle', 'calculate', 'compute', 'generate',
+    'parse', 'format', 'convert', 'transform', 'check', 'verify',
+    'api', 'helper', 'utility', 'core', 'main', 'initialize',
+    'settings', 'config', 'database', 'model', 'view', 'controller',
+    'error', 'exception', 'event', 'callback', 'hook', 'send'
+)
+
 
 def check_and_install_requirements():
     """
@@ -215,6 +292,83 @@ def get_supported_extensions() -> List[str]:
     return sorted(extensions)
 
 
+def _read_source(file_path: str) -> str:
+    """
+    Read a source file as UTF-8 text with universal newlines.
+
+    Reads the whole file in one call and decodes it once, instead of going
+    through a buffered text wrapper; line endings are normalized to '\\n' just
+    as text mode would.
+
+    Args:
+        file_path (str): Path to the source file
+
+    Returns:
+        str: The file's contents
+    """
+    source = Path(file_path).read_bytes().decode('utf-8')
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
+    return source
+
+
+@lru_cache(maxsize=16)
+def _parse_cached(file_path: str, mtime: float) -> Tuple[ast.Module, str]:
+    """
+    Read and parse a Python file, memoized on its path and modification time.
+
+    The interactive interface often shards the same file several times while
+    trying different strategies; keying on mtime means an edited file is
+    parsed again while an unchanged one reuses its tree.
+
+    Args:
+        file_path (str): Path to the Python file
+        mtime (float): The file's modification time, part of the cache key
+
+    Returns:
+        Tuple[ast.Module, str]: AST tree and source code
+    """
+    source = _read_source(file_path)
+    return ast.parse(source), source
+
+
+class CodeElement(dict):
+    """
+    Element metadata dict whose 'source' text is only built when first read.
+
+    Extraction records how to slice each element's lines out of the file; the
+    text itself is materialized when a shard or clustering pass asks for it,
+    through either element['source'] or element.get('source'). copy() keeps the
+    lazy loader, since dict.copy() would return a plain dict without 'source'.
+    """
+    __slots__ = ('_source_loader',)
+
+    def __init__(self, source_loader: Callable[[], str], fields: Dict[str, Any]):
+        """
+        Initialize the element.
+
+        Args:
+            source_loader (Callable[[], str]): Returns the element's source text
+            fields (Dict[str, Any]): The element's other metadata
+        """
+        super().__init__(fields)
+        self._source_loader = source_loader
+
+    def __missing__(self, key: str) -> Any:
+        if key != 'source':
+            raise KeyError(key)
+        source = self['source'] = self._source_loader()
+        return source
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self or key == 'source':
+            return self[key]
+        return default
+
+    def copy(self) -> 'CodeElement':
+        return CodeElement(self._source_loader, self)
+
+
 # Abstract base class for language parsers
 class LanguageParser(ABC):
     """
@@ -233,6 +387,80 @@ class LanguageParser(ABC):
         """
         self.language_id = language_id
         self.language_info = SUPPORTED_LANGUAGES[language_id]
+        # Lines of the most recently split source, shared by the extraction passes
+        self._last_source = None
+        self._last_lines = []
+        self._last_spans = None  # Line offsets in _last_source (False if they can't be used)
+
+    def _get_lines(self, source: str) -> List[str]:
+        """
+        Return source.splitlines(), reusing the last result for the same source.
+
+        Args:
+            source (str): The source code
+
+        Returns:
+            List[str]: The source lines (shared; callers must not modify it)
+        """
+        if source is not self._last_source:
+            self._last_source = source
+            self._last_lines = source.splitlines()
+            self._last_spans = None
+        return self._last_lines
+
+    def _join_lines(self, source: str, start: int, end: int) -> str:
+        """
+        Return '\\n'.join(source.splitlines()[start:end]) as one slice of source.
+
+        Line offsets are found once per source; each call then copies the text
+        a single time instead of slicing the line list and joining it.
+
+        Args:
+            source (str): The source code
+            start (int): Index of the first line
+            end (int): Index one past the last line
+
+        Returns:
+            str: The lines joined with newlines
+        """
+        lines = self._get_lines(source)
+        if self._last_spans is None:
+            self._last_spans = self._line_spans(source) or False
+        if not self._last_spans:
+            return '\n'.join(lines[start:end])
+
+        starts, ends = self._last_spans
+        start, end, _ = slice(start, end).indices(len(lines))
+        if start >= end:
+            return ""
+        return source[starts[start]:ends[end - 1]]
+
+    @staticmethod
+    def _line_spans(source: str) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Find the start and end offset of every line in source.
+
+        Args:
+            source (str): The source code
+
+        Returns:
+            Optional[Tuple[List[int], List[int]]]: Line start and end offsets, or None when
+            the source has line breaks other than '\\n' (slices would keep those characters)
+        """
+        if OTHER_LINE_BREAK_RE.search(source):
+            return None
+
+        starts, ends = [0], []
+        pos = source.find('\n')
+        while pos != -1:
+            ends.append(pos)
+            starts.append(pos + 1)
+            pos = source.find('\n', pos + 1)
+        if starts[-1] == len(source):
+            starts.pop()  # A trailing newline doesn't start another line
+        else:
+            ends.append(len(source))
+        return starts, ends
 
     @abstractmethod
     def parse_file(self, file_path: str) -> Tuple[Any, str]:
@@ -284,6 +512,55 @@ class PythonParser(LanguageParser):
     classes, methods, and detailed metadata extraction.
     """
 
+    def __init__(self, language_id: str):
+        """
+        Initialize the parser with language information.
+
+        Args:
+            language_id (str): Identifier for the programming language
+        """
+        super().__init__(language_id)
+        # Top-level statements of the most recently classified tree, by kind
+        self._last_tree = None
+        self._last_body = {}
+
+    def _classify_body(self, tree: ast.Module) -> Dict[str, List[ast.stmt]]:
+        """
+        Sort a module's top-level statements by kind in a single pass.
+
+        Both extraction passes share the result, so the tree body is walked
+        and each node's kind checked only once per file.
+
+        Args:
+            tree (ast.Module): The AST of the Python file
+
+        Returns:
+            Dict[str, List[ast.stmt]]: Statements under 'globals' (imports, annotated
+            assignments, type aliases and constant assignments), 'functions', 'classes'
+            and 'assigns', each in source order
+        """
+        if tree is self._last_tree:
+            return self._last_body
+
+        body = {'globals': [], 'functions': [], 'classes': [], 'assigns': []}
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                body['functions'].append(node)
+            elif isinstance(node, ast.ClassDef):
+                body['classes'].append(node)
+            elif isinstance(node, ast.Assign):
+                body['assigns'].append(node)
+                # A constant: only plain names assigned, at least one of them upper case
+                if (all(isinstance(target, ast.Name) for target in node.targets) and
+                        any(target.id.isupper() for target in node.targets)):
+                    body['globals'].append(node)
+            elif isinstance(node, PY_GLOBAL_NODES):
+                body['globals'].append(node)
+
+        self._last_tree = tree
+        self._last_body = body
+        return body
+
     def parse_file(self, file_path: str) -> Tuple[ast.Module, str]:
         """
         Parse a Python file using AST and return the tree and source code.
@@ -299,9 +576,7 @@ class PythonParser(LanguageParser):
             Exception: For other errors reading the file
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-            return ast.parse(source), source
+            return _parse_cached(file_path, os.path.getmtime(file_path))
         except SyntaxError as e:
             print(f"Error parsing {file_path}: {e}")
             raise
@@ -326,25 +601,8 @@ class PythonParser(LanguageParser):
         imports_and_globals = []
         line_numbers = []
 
-        for node in tree.body:
-            if isinstance(node, (ast.Import, ast.ImportFrom)) or (
-                    isinstance(node, ast.Assign) and all(
-                isinstance(target, ast.Name) for target in node.targets
-            )
-            ) or isinstance(node, (ast.AnnAssign, ast.ClassDef, ast.TypeAlias)):
-                # Check if it's a constant or type definition
-                is_constant = False
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and target.id.isupper():
-                            is_constant = True
-                            break
-
-                # Only include constants and type definitions in imports_and_globals
-                if (isinstance(node, (ast.Import, ast.ImportFrom)) or
-                        is_constant or
-                        isinstance(node, (ast.AnnAssign, ast.TypeAlias))):
-                    line_numbers.append((node.lineno, getattr(node, 'end_lineno', node.lineno)))
+        for node in self._classify_body(tree)['globals']:
+            line_numbers.append((node.lineno, node.end_lineno))
 
         if not line_numbers:
             return ""
@@ -353,7 +611,7 @@ class PythonParser(LanguageParser):
         line_numbers.sort()
 
         # Extract lines from source
-        source_lines = source.splitlines()
+        source_lines = self._get_lines(source)
         for start, end in line_numbers:
             # Adjust for 0-indexed lines in list vs 1-indexed in AST
             imports_and_globals.extend(source_lines[start - 1:end])
@@ -383,95 +641,93 @@ class PythonParser(LanguageParser):
             'module_code': []
         }
 
-        source_lines = source.splitlines()
-        processed_line_ranges = set()
+        source_lines = self._get_lines(source)
+        processed_line_ranges = []  # Inclusive (start, end) pairs
+
+        body = self._classify_body(tree)
 
         # Extract top-level functions
-        for node in tree.body:
-            if isinstance(node, ast.FunctionDef):
-                start_line = node.lineno - 1
-                end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line
-                processed_line_ranges.add((start_line, end_line))
-
-                # Extract function source
-                function_source = '\n'.join(source_lines[start_line:end_line])
-
-                # Extract parameter and return info
-                parameters = self._extract_parameters_from_source(function_source)
-                return_type = self._extract_return_type_from_source(function_source)
-
-                elements['functions'].append({
-                    'name': node.name,
-                    'source': function_source,
-                    'docstring': ast.get_docstring(node) or "",
-                    'decorators': [self._extract_decorator_name(d) for d in node.decorator_list],
-                    'parameters': parameters,
-                    'return_type': return_type,
-                    'lineno': node.lineno
-                })
+        for node in body['functions']:
+            start_line = node.lineno - 1
+            end_line = node.end_lineno
+            processed_line_ranges.append((start_line, end_line))
+
+            # Extract parameter and return info
+            parameters = self._extract_parameters(node)
+            return_type = self._extract_return_type(node)
+
+            # Source is sliced out of the file only when first needed
+            elements['functions'].append(CodeElement(partial(self._join_lines, source, start_line, end_line), {
+                'name': node.name,
+                'docstring': ast.get_docstring(node) or "",
+                'decorators': [self._extract_decorator_name(d) for d in node.decorator_list],
+                'parameters': parameters,
+                'return_type': return_type,
+                'lineno': node.lineno
+            }))
 
         # Extract classes and their methods
-        for node in tree.body:
-            if isinstance(node, ast.ClassDef):
-                start_line = node.lineno - 1
-                end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line
-                processed_line_ranges.add((start_line, end_line))
-
-                class_methods = []
-
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef):
-                        method_start = item.lineno - 1
-                        method_end = item.end_lineno if hasattr(item, 'end_lineno') else method_start
-
-                        # Extract method source
-                        method_source = '\n'.join(source_lines[method_start:method_end])
-
-                        # Extract parameter and return info
-                        parameters = self._extract_parameters_from_source(method_source)
-                        return_type = self._extract_return_type_from_source(method_source)
-
-                        method_info = {
-                            'name': f"{node.name}.{item.name}",
-                            'method_name': item.name,
-                            'class_name': node.name,
-                            'source': method_source,
-                            'docstring': ast.get_docstring(item) or "",
-                            'decorators': [self._extract_decorator_name(d) for d in item.decorator_list],
-                            'parameters': parameters,
-                            'return_type': return_type,
-                            'lineno': item.lineno
-                        }
-                        class_methods.append(method_info)
-                        elements['methods'].append(method_info)
-
-                elements['classes'].append({
-                    'name': node.name,
-                    'source': '\n'.join(source_lines[start_line:end_line]),
-                    'docstring': ast.get_docstring(node) or "",
-                    'methods': class_methods,
-                    'decorators': [self._extract_decorator_name(d) for d in node.decorator_list],
-                    'lineno': node.lineno
-                })
+        for node in body['classes']:
+            start_line = node.lineno - 1
+            end_line = node.end_lineno
+            processed_line_ranges.append((start_line, end_line))
+
+            class_methods = []
+
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    method_start = item.lineno - 1
+                    method_end = item.end_lineno
+
+                    # Extract parameter and return info
+                    parameters = self._extract_parameters(item)
+                    return_type = self._extract_return_type(item)
+
+                    method_info = CodeElement(partial(self._join_lines, source, method_start, method_end), {
+                        'name': f"{node.name}.{item.name}",
+                        'method_name': item.name,
+                        'class_name': node.name,
+                        'docstring': ast.get_docstring(item) or "",
+                        'decorators': [self._extract_decorator_name(d) for d in item.decorator_list],
+                        'parameters': parameters,
+                        'return_type': return_type,
+                        'lineno': item.lineno
+                    })
+                    class_methods.append(method_info)
+                    elements['methods'].append(method_info)
+
+            elements['classes'].append(CodeElement(partial(self._join_lines, source, start_line, end_line), {
+                'name': node.name,
+                'docstring': ast.get_docstring(node) or "",
+                'methods': class_methods,
+                'decorators': [self._extract_decorator_name(d) for d in node.decorator_list],
+                'lineno': node.lineno
+            }))
 
         # Extract constants (uppercase variable assignments)
-        for node in tree.body:
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id.isupper():
-                        start_line = node.lineno - 1
-                        end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line
-                        processed_line_ranges.add((start_line, end_line))
-
-                        elements['constants'].append({
-                            'name': target.id,
-                            'source': '\n'.join(source_lines[start_line:end_line]),
-                            'lineno': node.lineno
-                        })
+        for node in body['assigns']:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    start_line = node.lineno - 1
+                    end_line = node.end_lineno
+                    processed_line_ranges.append((start_line, end_line))
+
+                    elements['constants'].append(CodeElement(partial(self._join_lines, source, start_line, end_line), {
+                        'name': target.id,
+                        'lineno': node.lineno
+                    }))
+
+        # Mark the processed ranges (inclusive) in a per-line bitmap; each slice is filled in C
+        processed_lines = bytearray(len(source_lines))
+        for start, end in processed_line_ranges:
+            end = min(end + 1, len(source_lines))
+            processed_lines[start:end] = b'\x01' * (end - start)
 
         # Collect module-level code not part of functions or classes
         for i, line in enumerate(source_lines):
-            if all(not (start <= i <= end) for start, end in processed_line_ranges) and line.strip():
+            if processed_lines[i]:
+                continue
+            if line.strip():
                 elements['module_code'].append({
                     'source': line,
                     'lineno': i + 1
@@ -494,7 +750,8 @@ class PythonParser(LanguageParser):
         elif isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name):
             return decorator.func.id
         elif isinstance(decorator, ast.Attribute):
-            return f"{self._extract_attribute_name(decorator)}"
+            # Dotted names are built fresh each time; share one copy of each
+            return sys.intern(self._extract_attribute_name(decorator))
         return "unknown_decorator"
 
     def _extract_attribute_name(self, attr: ast.Attribute) -> str:
@@ -507,122 +764,46 @@ class PythonParser(LanguageParser):
         Returns:
             str: The fully qualified attribute name
         """
-        if isinstance(attr.value, ast.Name):
-            return f"{attr.value.id}.{attr.attr}"
-        elif isinstance(attr.value, ast.Attribute):
-            return f"{self._extract_attribute_name(attr.value)}.{attr.attr}"
-        return f"?.{attr.attr}"
-
-    def _extract_parameters_from_source(self, source_code: str) -> List[Dict[str, str]]:
+        # Walk down the chain of attributes instead of recursing
+        parts = [attr.attr]
+        value = attr.value
+        while isinstance(value, ast.Attribute):
+            parts.append(value.attr)
+            value = value.value
+        parts.append(value.id if isinstance(value, ast.Name) else "?")
+        return ".".join(reversed(parts))
+
+    def _extract_parameters(self, node: ast.FunctionDef) -> List[Dict[str, str]]:
         """
-        Extract parameter information from function source code.
+        Extract parameter information from a function's AST node.
 
-        Parses the function signature to extract parameter names and their
-        type annotations if available.
+        Reads names and type annotations straight from the parsed signature,
+        so multi-line signatures, defaults and nested types need no re-parsing.
 
         Args:
-            source_code (str): The function's source code
+            node (ast.FunctionDef): The function's AST node
 
         Returns:
             List[Dict[str, str]]: A list of parameter dictionaries with 'name' and 'type' keys
         """
-        # Find the function definition line with parameters
-        lines = source_code.split('\n')
-        def_line = ""
-        for line in lines:
-            if re.match(r'\s*def\s+\w+\s*\(', line):
-                def_line = line
-                # Check if the parameter list continues to next lines
-                param_end_idx = -1
-                if def_line.count('(') > def_line.count(')'):
-                    current_idx = lines.index(line)
-                    next_lines = lines[current_idx + 1:]
-                    param_end_idx = current_idx  # Start with the current line
-
-                    for i, next_line in enumerate(next_lines):
-                        def_line += " " + next_line.strip()
-                        param_end_idx = current_idx + i + 1
-                        if def_line.count('(') <= def_line.count(')'):
-                            break
-                break
-
-        if not def_line:
-            return []
-
-        # Extract parameter text from the definition
-        param_text = re.search(r'\(\s*(.*?)\s*\)', def_line)
-        if not param_text:
-            return []
-
-        param_text = param_text.group(1)
-        if not param_text:
-            return []
-
-        # Parse each parameter
-        parameters = []
-        # Split by commas, but be careful about nested types like List[str, int]
-        param_items = []
-        bracket_level = 0
-        current_param = ""
-
-        for char in param_text:
-            if char == ',' and bracket_level == 0:
-                param_items.append(current_param.strip())
-                current_param = ""
-            else:
-                current_param += char
-                if char == '[':
-                    bracket_level += 1
-                elif char == ']':
-                    bracket_level -= 1
-
-        if current_param:  # Add the last parameter
-            param_items.append(current_param.strip())
-
-        for item in param_items:
-            if not item or item == 'self':
-                continue
-
-            # Extract name and type annotation if present
-            param_dict = {}
-            type_match = re.match(r'(\w+)\s*:\s*([\w\[\],\s\.\'"]+)', item)
-            if type_match:
-                param_dict["name"] = type_match.group(1)
-                param_dict["type"] = type_match.group(2).strip()
-            else:
-                # No type annotation, just the name (possibly with default value)
-                name_match = re.match(r'(\w+)(?:\s*=\s*.*)?', item)
-                if name_match:
-                    param_dict["name"] = name_match.group(1)
-                    param_dict["type"] = ""
-
-            if param_dict:
-                parameters.append(param_dict)
-
-        return parameters
-
-    def _extract_return_type_from_source(self, source_code: str) -> str:
+        args = node.args
+        return [
+            {'name': arg.arg, 'type': sys.intern(ast.unparse(arg.annotation)) if arg.annotation else ""}
+            for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs)
+            if arg.arg != 'self'
+        ]
+
+    def _extract_return_type(self, node: ast.FunctionDef) -> str:
         """
-        Extract return type information from function source code.
-
-        Looks for the return type annotation in the function signature.
+        Extract the return type annotation from a function's AST node.
 
         Args:
-            source_code (str): The function's source code
+            node (ast.FunctionDef): The function's AST node
 
         Returns:
             str: The return type annotation or empty string if none found
         """
-        # Check for return type annotation
-        lines = source_code.split('\n')
-        for line in lines:
-            if "->" in line and re.match(r'\s*def\s+\w+\s*\(', line):
-                # Extract return type
-                return_match = re.search(r'->\s*([\w\[\],\s\.\'"]+)(?:\s*:)?', line)
-                if return_match:
-                    return return_match.group(1).strip()
-
-        return ""
+        return sys.intern(ast.unparse(node.returns)) if node.returns else ""
 
 
 class CppParser(LanguageParser):
@@ -651,8 +832,7 @@ class CppParser(LanguageParser):
             Exception: For errors reading the file
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
+            source = _read_source(file_path)
             return source, source
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
@@ -670,7 +850,7 @@ class CppParser(LanguageParser):
             str: String containing includes and global definitions
         """
         includes_and_globals = []
-        lines = source.splitlines()
+        lines = self._get_lines(source)
 
         for line in lines:
             stripped = line.strip()
@@ -691,7 +871,7 @@ class CppParser(LanguageParser):
             elif stripped.startswith('typedef '):
                 includes_and_globals.append(line)
             # Global constants (simple heuristic)
-            elif re.match(r'^\s*(const|static|extern)\s+', line):
+            elif CPP_GLOBAL_RE.match(line):
                 includes_and_globals.append(line)
 
         if includes_and_globals:
@@ -720,179 +900,150 @@ class CppParser(LanguageParser):
             'module_code': []
         }
 
-        lines = source.splitlines()
-        processed_lines = set()
+        lines = self._get_lines(source)
+        # Opening braces and net braces opened on each line, counted once for all the
+        # brace checks and brace-matching scans
+        open_braces = [line.count('{') for line in lines]
+        brace_delta = [opened - line.count('}') for opened, line in zip(open_braces, lines)]
+        find_block_end = self._block_end_finder(brace_delta)
+        element_match = CPP_ELEMENT_RE.match
+        template_match = CPP_TEMPLATE_RE.match
+        const_match = CPP_CONST_RE.match
+
+        # Every element's lines form one range starting at the element itself, so
+        # "already claimed" is just "at or before the furthest end seen so far".
+        # Namespaces claim lines first, then classes, functions and templates;
+        # each kind only skips lines claimed by itself or an earlier kind.
+        namespace_end = class_end = function_end = template_end = -1
 
-        # Extract namespaces
-        namespace_pattern = r'^\s*namespace\s+(\w+)\s*\{'
         for i, line in enumerate(lines):
-            if match := re.match(namespace_pattern, line):
-                namespace_name = match.group(1)
-                # Find the end of the namespace (simplified)
-                start_line = i
-                brace_count = 1
-                end_line = i
-
-                for j in range(i + 1, len(lines)):
-                    brace_count += lines[j].count('{') - lines[j].count('}')
-                    if brace_count == 0:
-                        end_line = j
-                        break
-
-                namespace_source = '\n'.join(lines[start_line:end_line + 1])
-                elements['namespaces'].append({
-                    'name': namespace_name,
-                    'source': namespace_source,
-                    'lineno': i + 1
-                })
-
-                for k in range(start_line, end_line + 1):
-                    processed_lines.add(k)
-
-        # Extract classes
-        class_pattern = r'^\s*(class|struct)\s+(\w+)(?:\s*:\s*[^{]*)?(?:\s*\{)?'
-        for i, line in enumerate(lines):
-            if i in processed_lines:
-                continue
-
-            if match := re.match(class_pattern, line):
-                class_type = match.group(1)
-                class_name = match.group(2)
-
-                # Find the complete class definition
-                start_line = i
-                if '{' in line:
-                    brace_count = line.count('{') - line.count('}')
-                    end_line = i
-
-                    for j in range(i + 1, len(lines)):
-                        brace_count += lines[j].count('{') - lines[j].count('}')
-                        if brace_count == 0:
-                            end_line = j
-                            break
-                else:
-                    # Look for opening brace on next lines
-                    end_line = i
-                    for j in range(i + 1, min(i + 5, len(lines))):
-                        if '{' in lines[j]:
-                            brace_count = lines[j].count('{') - lines[j].count('}')
-                            for k in range(j + 1, len(lines)):
-                                brace_count += lines[k].count('{') - lines[k].count('}')
-                                if brace_count == 0:
-                                    end_line = k
-                                    break
-                            break
-
-                class_source = '\n'.join(lines[start_line:end_line + 1])
-
-                # Extract methods from this class
-                class_methods = self._extract_class_methods(class_source, class_name, start_line)
-
-                elements['classes'].append({
-                    'name': class_name,
-                    'type': class_type,
-                    'source': class_source,
-                    'methods': class_methods,
-                    'lineno': i + 1
-                })
-
-                # Add methods to the methods list
-                elements['methods'].extend(class_methods)
+            # Each element pattern needs one of these substrings; most body lines have none
+            if '(' in line or 'class' in line or 'struct' in line or 'namespace' in line:
+                match = element_match(line)
+            else:
+                match = None
+            if match and match.lastindex:
+                # Extract namespaces
+                if match.group(1) is not None:
+                    namespace_name = match.group(1)
+                    # Find the end of the namespace (simplified)
+                    start_line = i
+                    end_line = find_block_end(i + 1, 1, i)
+
+                    elements['namespaces'].append(CodeElement(partial(self._join_lines, source, start_line, end_line + 1), {
+                        'name': namespace_name,
+                        'lineno': i + 1
+                    }))
+
+                    namespace_end = max(namespace_end, end_line)
+
+                # Extract classes
+                if match.group(3) is not None and i > namespace_end and i > class_end:
+                    class_type = match.group(2)
+                    class_name = match.group(3)
+
+                    # Find the complete class definition
+                    start_line = i
+                    if open_braces[i]:
+                        end_line = find_block_end(i + 1, brace_delta[i], i)
+                    else:
+                        # Look for opening brace on next lines
+                        end_line = i
+                        for j in range(i + 1, min(i + 5, len(lines))):
+                            if open_braces[j]:
+                                end_line = find_block_end(j + 1, brace_delta[j], i)
+                                break
 
-                for k in range(start_line, end_line + 1):
-                    processed_lines.add(k)
+                    class_source = self._join_lines(source, start_line, end_line + 1)
 
-        # Extract standalone functions
-        function_pattern = r'^\s*(?:(?:static|inline|virtual|explicit|constexpr)\s+)*(?:\w+(?:\s*\*|\s*&)?(?:\s*::\s*\w+)*\s+)+(\w+)\s*\([^)]*\)(?:\s*const)?(?:\s*override)?(?:\s*final)?(?:\s*noexcept)?(?:\s*\{|;)'
-        for i, line in enumerate(lines):
-            if i in processed_lines:
-                continue
+                    # Extract methods from this class
+                    class_methods = self._extract_class_methods(class_source, class_name, start_line,
+                                                                brace_delta[start_line:end_line + 1])
 
-            if match := re.match(function_pattern, line):
-                func_name = match.group(1)
+                    elements['classes'].append({
+                        'name': class_name,
+                        'type': class_type,
+                        'source': class_source,
+                        'methods': class_methods,
+                        'lineno': i + 1
+                    })
 
-                # Skip obvious non-functions
-                if func_name in ['if', 'for', 'while', 'switch', 'catch']:
-                    continue
+                    # Add methods to the methods list
+                    elements['methods'].extend(class_methods)
 
-                start_line = i
-                end_line = i
+                    class_end = max(class_end, end_line)
 
-                # If function has body (contains {)
-                if '{' in line:
-                    brace_count = line.count('{') - line.count('}')
+                # Extract standalone functions
+                if match.group(4) is not None and i > max(namespace_end, class_end, function_end):
+                    func_name = match.group(4)
 
-                    for j in range(i + 1, len(lines)):
-                        brace_count += lines[j].count('{') - lines[j].count('}')
-                        if brace_count == 0:
-                            end_line = j
-                            break
-                else:
-                    # Function declaration only (ends with ;)
-                    if ';' in line:
+                    # Skip obvious non-functions
+                    if func_name not in ['if', 'for', 'while', 'switch', 'catch']:
+                        start_line = i
                         end_line = i
-                    else:
-                        # Look for ; on next few lines
-                        for j in range(i + 1, min(i + 3, len(lines))):
-                            if ';' in lines[j]:
-                                end_line = j
-                                break
-
-                func_source = '\n'.join(lines[start_line:end_line + 1])
 
-                # Extract function metadata
-                parameters = self._extract_cpp_parameters(func_source)
-                return_type = self._extract_cpp_return_type(func_source)
-
-                elements['functions'].append({
-                    'name': func_name,
-                    'source': func_source,
-                    'parameters': parameters,
-                    'return_type': return_type,
-                    'lineno': i + 1
-                })
+                        # If function has body (contains {)
+                        if open_braces[i]:
+                            end_line = find_block_end(i + 1, brace_delta[i], i)
+                        else:
+                            # Function declaration only (ends with ;)
+                            if ';' in line:
+                                end_line = i
+                            else:
+                                # Look for ; on next few lines
+                                for j in range(i + 1, min(i + 3, len(lines))):
+                                    if ';' in lines[j]:
+                                        end_line = j
+                                        break
+
+                        func_source = self._join_lines(source, start_line, end_line + 1)
+
+                        # Extract function metadata
+                        parameters = self._extract_cpp_parameters(func_source)
+                        return_type = self._extract_cpp_return_type(func_source)
+
+                        elements['functions'].append({
+                            'name': func_name,
+                            'source': func_source,
+                            'parameters': parameters,
+                            'return_type': return_type,
+                            'lineno': i + 1
+                        })
 
-                for k in range(start_line, end_line + 1):
-                    processed_lines.add(k)
+                        function_end = max(function_end, end_line)
 
-        # Extract templates
-        template_pattern = r'^\s*template\s*<[^>]*>\s*'
-        for i, line in enumerate(lines):
-            if i in processed_lines:
+            if i <= max(namespace_end, class_end, function_end, template_end):
                 continue
 
-            if re.match(template_pattern, line):
+            stripped = line.strip()
+
+            # Extract templates
+            if stripped.startswith('template') and template_match(line):
                 # Find the templated declaration (next non-empty line typically)
                 start_line = i
                 end_line = i
 
                 # Look for the actual template definition
                 for j in range(i + 1, min(i + 10, len(lines))):
-                    if lines[j].strip() and not lines[j].strip().startswith('//'):
+                    next_stripped = lines[j].strip()
+                    if next_stripped and not next_stripped.startswith('//'):
                         # Found the templated item, now find its end
-                        if '{' in lines[j]:
-                            brace_count = lines[j].count('{') - lines[j].count('}')
-                            end_line = j
-
-                            for k in range(j + 1, len(lines)):
-                                brace_count += lines[k].count('{') - lines[k].count('}')
-                                if brace_count == 0:
-                                    end_line = k
-                                    break
+                        if open_braces[j]:
+                            end_line = find_block_end(j + 1, brace_delta[j], j)
                         elif ';' in lines[j]:
                             end_line = j
                         break
 
-                template_source = '\n'.join(lines[start_line:end_line + 1])
+                template_source = self._join_lines(source, start_line, end_line + 1)
 
                 # Extract template name (simplified)
                 template_name = "template"
                 if 'class ' in template_source or 'struct ' in template_source:
-                    class_match = re.search(r'(?:class|struct)\s+(\w+)', template_source)
+                    class_match = CPP_TEMPLATE_CLASS_RE.search(template_source)
                     if class_match:
                         template_name = f"template<{class_match.group(1)}>"
                 elif 'function' in template_source or '(' in template_source:
-                    func_match = re.search(r'(\w+)\s*\(', template_source)
+                    func_match = CPP_TEMPLATE_FUNCTION_RE.search(template_source)
                     if func_match:
                         template_name = f"template<{func_match.group(1)}>"
 
@@ -902,27 +1053,19 @@ class CppParser(LanguageParser):
                     'lineno': i + 1
                 })
 
-                for k in range(start_line, end_line + 1):
-                    processed_lines.add(k)
+                template_end = max(template_end, end_line)
 
-        # Extract constants and global variables
-        const_pattern = r'^\s*(?:const|static|extern)\s+.*?(\w+)(?:\s*=.*?)?;'
-        for i, line in enumerate(lines):
-            if i in processed_lines:
-                continue
-
-            if match := re.match(const_pattern, line):
+            # Extract constants and global variables
+            elif stripped.startswith(('const', 'static', 'extern')) and (match := const_match(line)):
                 const_name = match.group(1)
                 elements['constants'].append({
                     'name': const_name,
                     'source': line,
                     'lineno': i + 1
                 })
-                processed_lines.add(i)
 
-        # Collect remaining lines as module code
-        for i, line in enumerate(lines):
-            if i not in processed_lines and line.strip() and not line.strip().startswith('//'):
+            # Collect remaining lines as module code
+            elif stripped and not stripped.startswith('//'):
                 elements['module_code'].append({
                     'source': line,
                     'lineno': i + 1
@@ -930,7 +1073,41 @@ class CppParser(LanguageParser):
 
         return elements
 
-    def _extract_class_methods(self, class_source: str, class_name: str, class_start_line: int) -> List[Dict]:
+    def _block_end_finder(self, brace_delta: List[int]) -> Callable[[int, int, int], int]:
+        """
+        Build a lookup for the line where a brace-delimited block closes.
+
+        With prefix sums of the per-line brace deltas, "scan forward until the
+        running count hits zero" becomes "find the next prefix sum equal to a
+        target", answered by a binary search over the positions of each sum.
+
+        Args:
+            brace_delta (List[int]): Net braces opened on each line
+
+        Returns:
+            Callable[[int, int, int], int]: Function taking the first line to scan,
+            the brace count before that line and a default, returning the first line
+            where the count reaches zero (or the default if it never does)
+        """
+        prefix = list(accumulate(brace_delta, initial=0))
+
+        positions = defaultdict(list)
+        for idx, total in enumerate(prefix):
+            positions[total].append(idx)
+
+        def find_block_end(first: int, brace_count: int, default: int) -> int:
+            # The count after line j is brace_count + prefix[j + 1] - prefix[first]
+            candidates = positions.get(prefix[first] - brace_count)
+            if candidates:
+                idx = bisect_left(candidates, first + 1)
+                if idx < len(candidates):
+                    return candidates[idx] - 1
+            return default
+
+        return find_block_end
+
+    def _extract_class_methods(self, class_source: str, class_name: str, class_start_line: int,
+                               brace_delta: Optional[List[int]] = None) -> List[Dict]:
         """
         Extract methods from a C++ class definition.
 
@@ -938,18 +1115,25 @@ class CppParser(LanguageParser):
             class_source (str): The complete class source code
             class_name (str): Name of the class
             class_start_line (int): Starting line number of the class
+            brace_delta (Optional[List[int]]): Net braces opened on each class line, if
+                already counted for the whole file
 
         Returns:
             List[Dict]: List of method information dictionaries
         """
         methods = []
         lines = class_source.splitlines()
+        if brace_delta is None:
+            brace_delta = [line.count('{') - line.count('}') for line in lines]
+        find_block_end = self._block_end_finder(brace_delta)
 
         # Look for method definitions within the class
-        method_pattern = r'^\s*(?:(?:public|private|protected):\s*)?(?:(?:static|virtual|inline|explicit|constexpr)\s+)*(?:\w+(?:\s*\*|\s*&)?(?:\s*::\s*\w+)*\s+)*(\w+)\s*\([^)]*\)(?:\s*const)?(?:\s*override)?(?:\s*final)?(?:\s*noexcept)?(?:\s*\{|;)'
+        method_match = CPP_METHOD_RE.match
+        if RE2_AVAILABLE and class_source.isascii() and '\x1f' not in class_source:
+            method_match = CPP_METHOD_RE2.match
 
         for i, line in enumerate(lines):
-            if match := re.match(method_pattern, line):
+            if '(' in line and (match := method_match(line)):
                 method_name = match.group(1)
 
                 # Skip constructors, destructors, and obvious non-methods
@@ -962,15 +1146,13 @@ class CppParser(LanguageParser):
 
                 # Find method body if it exists
                 if '{' in line:
-                    brace_count = line.count('{') - line.count('}')
-
-                    for j in range(i + 1, len(lines)):
-                        brace_count += lines[j].count('{') - lines[j].count('}')
-                        if brace_count == 0:
-                            end_line = j
-                            break
+                    end_line = find_block_end(i + 1, brace_delta[i], i)
 
-                method_source = '\n'.join(lines[start_line:end_line + 1])
+                # A one-line method (usually a declaration) is the line itself, no copy needed
+                if end_line == start_line:
+                    method_source = line
+                else:
+                    method_source = '\n'.join(lines[start_line:end_line + 1])
 
                 # Extract method metadata
                 parameters = self._extract_cpp_parameters(method_source)
@@ -1001,7 +1183,7 @@ class CppParser(LanguageParser):
         parameters = []
 
         # Find the parameter list
-        param_match = re.search(r'\(([^)]*)\)', source_code)
+        param_match = CPP_PARAM_LIST_RE.search(source_code)
         if not param_match:
             return parameters
 
@@ -1010,23 +1192,7 @@ class CppParser(LanguageParser):
             return parameters
 
         # Split parameters by comma, being careful about template parameters
-        param_items = []
-        bracket_level = 0
-        current_param = ""
-
-        for char in param_text:
-            if char == ',' and bracket_level == 0:
-                param_items.append(current_param.strip())
-                current_param = ""
-            else:
-                current_param += char
-                if char in '<(':
-                    bracket_level += 1
-                elif char in '>)':
-                    bracket_level -= 1
-
-        if current_param:
-            param_items.append(current_param.strip())
+        param_items = _split_params(param_text, '<(', '>)')
 
         # Parse each parameter
         for param in param_items:
@@ -1034,7 +1200,8 @@ class CppParser(LanguageParser):
                 continue
 
             # Remove default values - FIXED LINE
-            param = re.sub(r'\s*=\s*[^,]*$', '', param)
+            if '=' in param:
+                param = CPP_DEFAULT_VALUE_RE.sub('', param)
 
             # Extract type and name
             # Simple heuristic: last word is typically the parameter name
@@ -1043,7 +1210,7 @@ class CppParser(LanguageParser):
                 param_name = words[-1]
                 # Remove * and & from name if present
                 param_name = param_name.lstrip('*&')
-                param_type = ' '.join(words[:-1])
+                param_type = sys.intern(' '.join(words[:-1]))  # Types repeat heavily; share one copy
 
                 parameters.append({
                     'name': param_name,
@@ -1053,7 +1220,7 @@ class CppParser(LanguageParser):
                 # Just a type, no name (like in declarations)
                 parameters.append({
                     'name': '',
-                    'type': words[0]
+                    'type': sys.intern(words[0])
                 })
 
         return parameters
@@ -1072,20 +1239,59 @@ class CppParser(LanguageParser):
         lines = source_code.splitlines()
         for line in lines:
             # Skip preprocessor directives and comments
-            if line.strip().startswith('#') or line.strip().startswith('//'):
+            if line.lstrip().startswith(('#', '//')):
                 continue
 
             # Look for function signature pattern
-            func_match = re.match(r'^\s*(?:(?:static|inline|virtual|explicit|constexpr)\s+)*(.*?)\s+(\w+)\s*\(', line)
+            func_match = CPP_RETURN_TYPE_RE.match(line)
             if func_match:
                 return_type = func_match.group(1).strip()
                 # Clean up common prefixes that aren't part of return type
-                return_type = re.sub(r'^(?:public|private|protected)\s*:\s*', '', return_type)
-                return return_type
+                return_type = CPP_ACCESS_SPECIFIER_RE.sub('', return_type)
+                return sys.intern(return_type)
 
         return ""
 
 
+def _split_params(param_text: str, opening: str, closing: str) -> List[str]:
+    """
+    Split a parameter list on commas that are not nested inside brackets.
+
+    The text is split on every comma in one C-level call; fragments are then
+    re-joined while the brackets seen so far are unbalanced. Without brackets
+    (the usual case) nothing needs re-joining.
+
+    Args:
+        param_text (str): The text between a signature's parentheses
+        opening (str): The bracket characters that open a nesting level
+        closing (str): The bracket characters that close a nesting level
+
+    Returns:
+        List[str]: The stripped parameter strings
+    """
+    param_items = param_text.split(',')
+
+    if any(c in param_text for c in opening + closing):
+        parts, param_items = param_items, []
+        buf = None
+        depth = 0
+
+        for part in parts:
+            buf = part if buf is None else buf + ',' + part
+            depth += sum(part.count(c) for c in opening) - sum(part.count(c) for c in closing)
+            if depth == 0:
+                param_items.append(buf)
+                buf = None
+
+        if buf is not None:  # Brackets never balanced; keep the rest as one parameter
+            param_items.append(buf)
+
+    if not param_items[-1]:  # No empty parameter after a trailing comma
+        param_items.pop()
+
+    return [item.strip() for item in param_items]
+
+
 def _sanitize_filename(name: str) -> str:
     """
     Convert a string to a valid filename by replacing non-alphanumeric characters.
@@ -1096,14 +1302,27 @@ def _sanitize_filename(name: str) -> str:
     Returns:
         str: A sanitized string safe to use as a filename
     """
-    # Replace non-alphanumeric with underscores
-    return re.sub(r'[^\w]', '_', name)
+    # Replace non-alphanumeric with underscores; ASCII names go through a translate table
+    if name.isascii():
+        return name.translate(SANITIZE_TABLE)
+    return NON_WORD_RE.sub('_', name)
 
 
+# Parser class for each language identifier in SUPPORTED_LANGUAGES
+PARSER_CLASSES = {
+    'python': PythonParser,
+    'cpp': CppParser
+}
+
+
+@lru_cache(maxsize=None)
 def get_parser(language_id: str) -> LanguageParser:
     """
     Get the appropriate parser for a given language.
 
+    One instance is shared per language; parsers only cache results keyed
+    by the source they were last given.
+
     Args:
         language_id (str): The language identifier
 
@@ -1113,12 +1332,10 @@ def get_parser(language_id: str) -> LanguageParser:
     Raises:
         ValueError: If the language is not supported
     """
-    if language_id == 'python':
-        return PythonParser(language_id)
-    elif language_id == 'cpp':
-        return CppParser(language_id)
-    else:
+    parser_class = PARSER_CLASSES.get(language_id)
+    if parser_class is None:
         raise ValueError(f"Unsupported language: {language_id}")
+    return parser_class(language_id)
 
 
 # Clustering functions (language-agnostic)
@@ -1151,6 +1368,27 @@ def cluster_by_type(elements: Dict[str, List[Dict]], max_elements_per_shard: int
     return clusters
 
 
+def _name_prefix(name: str) -> str:
+    """
+    Find the grouping prefix of a function or method name.
+
+    A snake_case prefix ('get_') is found with str.partition, so the regex is
+    only needed for camelCase names.
+
+    Args:
+        name (str): The function or method name
+
+    Returns:
+        str: The snake_case or camelCase prefix, else the first three characters or 'other'
+    """
+    head, sep, _ = name.partition('_')
+    if sep and head.isascii() and head.isalpha() and head.islower():
+        return head + sep
+    if match := CAMEL_PREFIX_RE.match(name):
+        return match.group(1)
+    return name[:3] if len(name) >= 3 else 'other'
+
+
 def cluster_by_name_prefix(elements: Dict[str, List[Dict]], max_elements_per_shard: int) -> Dict[str, List[Dict]]:
     """
     Group code elements by common prefixes/patterns in their names.
@@ -1170,14 +1408,7 @@ def cluster_by_name_prefix(elements: Dict[str, List[Dict]], max_elements_per_sha
         for func in elements['functions']:
             name = func['name']
             # Try different prefix patterns
-            if match := re.match(r'^([a-z]+_)', name):
-                prefix = match.group(1)
-            elif match := re.match(r'^([a-z]+[A-Z][a-z]*)', name):
-                prefix = match.group(1)
-            elif len(name) >= 3:
-                prefix = name[:3]
-            else:
-                prefix = 'other'
+            prefix = _name_prefix(name)
 
             func_prefixes[f'func_{prefix}'].append(func)
 
@@ -1197,14 +1428,7 @@ def cluster_by_name_prefix(elements: Dict[str, List[Dict]], max_elements_per_sha
             name = method.get('method_name', method['name'])
 
             # Try different prefix patterns
-            if match := re.match(r'^([a-z]+_)', name):
-                prefix = match.group(1)
-            elif match := re.match(r'^([a-z]+[A-Z][a-z]*)', name):
-                prefix = match.group(1)
-            elif len(name) >= 3:
-                prefix = name[:3]
-            else:
-                prefix = 'other'
+            prefix = _name_prefix(name)
 
             # Include class name in the group to avoid mixing methods from different classes
             class_name = method.get('class_name', '')
@@ -1226,7 +1450,7 @@ def cluster_by_name_prefix(elements: Dict[str, List[Dict]], max_elements_per_sha
         for cls in elements['classes']:
             name = cls['name']
             # Try to find a meaningful prefix
-            if match := re.match(r'^([A-Z][a-z]+)', name):
+            if match := PASCAL_PREFIX_RE.match(name):
                 prefix = match.group(1)
             elif len(name) >= 3:
                 prefix = name[:3]
@@ -1252,6 +1476,25 @@ def cluster_by_name_prefix(elements: Dict[str, List[Dict]], max_elements_per_sha
     return clusters
 
 
+def _docstring_theme(element: Dict) -> Optional[str]:
+    """
+    Find the theme keyword for an element from its docstring and comments.
+
+    The docstring and any C++ comments in the source are joined and lowercased
+    once; the source is only searched for comments if it contains '//' or '/*'.
+
+    Args:
+        element (Dict): A code element
+
+    Returns:
+        Optional[str]: The first keyword in DOCSTRING_KEYWORDS that appears, or None
+    """
+    source = element.get('source', '')
+    source_comments = CPP_COMMENT_RE.findall(source) if '//' in source or '/*' in source else []
+    text_to_search = (element.get('docstring', '') + ' ' + ' '.join(source_comments)).lower()
+    return next((keyword for keyword in DOCSTRING_KEYWORDS if keyword in text_to_search), None)
+
+
 def cluster_by_docstring(elements: Dict[str, List[Dict]], max_elements_per_shard: int) -> Dict[str, List[Dict]]:
     """
     Group code elements based on similarity in their docstrings/comments.
@@ -1265,34 +1508,13 @@ def cluster_by_docstring(elements: Dict[str, List[Dict]], max_elements_per_shard
     """
     clusters = {}
 
-    # Keywords to look for in docstrings/comments
-    common_keywords = [
-        'create', 'update', 'delete', 'get', 'list', 'find', 'search',
-        'validate', 'process', 'handle', 'calculate', 'compute', 'generate',
-        'parse', 'format', 'convert', 'transform', 'check', 'verify',
-        'api', 'helper', 'utility', 'core', 'main', 'initialize',
-        'settings', 'config', 'database', 'model', 'view', 'controller',
-        'error', 'exception', 'event', 'callback', 'hook', 'send'
-    ]
-
     # Process functions
     if elements.get('functions'):
         func_themes = defaultdict(list)
         for func in elements['functions']:
-            docstring = func.get('docstring', '').lower()
-            # For C++, also check the source for comments
-            source_comments = re.findall(r'//.*?$|/\*.*?\*/', func.get('source', ''), re.MULTILINE | re.DOTALL)
-            comment_text = ' '.join(source_comments).lower()
-
-            text_to_search = docstring + ' ' + comment_text
-            found_keywords = []
+            theme = _docstring_theme(func)
 
-            for keyword in common_keywords:
-                if keyword in text_to_search:
-                    found_keywords.append(keyword)
-
-            if found_keywords:
-                theme = found_keywords[0]  # Use the first keyword found
+            if theme:
                 func_themes[f'func_{theme}'].append(func)
             else:
                 func_themes['func_other'].append(func)
@@ -1310,20 +1532,10 @@ def cluster_by_docstring(elements: Dict[str, List[Dict]], max_elements_per_shard
     if elements.get('methods'):
         method_themes = defaultdict(list)
         for method in elements['methods']:
-            docstring = method.get('docstring', '').lower()
-            source_comments = re.findall(r'//.*?$|/\*.*?\*/', method.get('source', ''), re.MULTILINE | re.DOTALL)
-            comment_text = ' '.join(source_comments).lower()
             class_name = method.get('class_name', '')
+            theme = _docstring_theme(method)
 
-            text_to_search = docstring + ' ' + comment_text
-            found_keywords = []
-
-            for keyword in common_keywords:
-                if keyword in text_to_search:
-                    found_keywords.append(keyword)
-
-            if found_keywords:
-                theme = found_keywords[0]  # Use the first keyword found
+            if theme:
                 method_themes[f'method_{class_name}_{theme}'].append(method)
             else:
                 method_themes[f'method_{class_name}_other'].append(method)
@@ -1341,19 +1553,9 @@ def cluster_by_docstring(elements: Dict[str, List[Dict]], max_elements_per_shard
     if elements.get('classes'):
         class_themes = defaultdict(list)
         for cls in elements['classes']:
-            docstring = cls.get('docstring', '').lower()
-            source_comments = re.findall(r'//.*?$|/\*.*?\*/', cls.get('source', ''), re.MULTILINE | re.DOTALL)
-            comment_text = ' '.join(source_comments).lower()
-
-            text_to_search = docstring + ' ' + comment_text
-            found_keywords = []
+            theme = _docstring_theme(cls)
 
-            for keyword in common_keywords:
-                if keyword in text_to_search:
-                    found_keywords.append(keyword)
-
-            if found_keywords:
-                theme = found_keywords[0]  # Use the first keyword found
+            if theme:
                 class_themes[f'class_{theme}'].append(cls)
             else:
                 class_themes['class_other'].append(cls)
@@ -1408,43 +1610,34 @@ def cluster_evenly(elements: Dict[str, List[Dict]], max_elements_per_shard: int)
             method_name = method.get('method_name', method['name'])
 
             # Try to identify logical grouping by name prefix
-            if match := re.match(r'^([a-z]+_)', method_name):
-                prefix = match.group(1)
-            elif match := re.match(r'^([a-z]+[A-Z][a-z]*)', method_name):
-                prefix = match.group(1)
-            elif len(method_name) >= 3:
-                prefix = method_name[:3]
-            else:
-                prefix = 'other'
+            prefix = _name_prefix(method_name)
 
             method_groups[prefix].append(method)
 
         # If we have very small groups, merge them
-        merged_groups = defaultdict(list)
+        merged_groups = {}
         current_group = []
-        current_size = 0
         group_index = 1
 
         # Sort prefixes to ensure deterministic order
-        for prefix in sorted(method_groups.keys()):
+        for prefix in sorted(method_groups):
             methods_in_group = method_groups[prefix]
-            if current_size + len(methods_in_group) <= max_elements_per_shard:
+            if len(current_group) + len(methods_in_group) <= max_elements_per_shard:
                 current_group.extend(methods_in_group)
-                current_size += len(methods_in_group)
-            else:
-                if current_group:
-                    merged_groups[f'methods_{group_index}'] = current_group
-                    group_index += 1
+                continue
 
-                # Check if this group needs to be split across multiple shards
-                if len(methods_in_group) > max_elements_per_shard:
-                    for i in range(0, len(methods_in_group), max_elements_per_shard):
-                        chunk = methods_in_group[i:i + max_elements_per_shard]
-                        merged_groups[f'methods_{group_index}'] = chunk
-                        group_index += 1
-                else:
-                    current_group = methods_in_group
-                    current_size = len(methods_in_group)
+            if current_group:
+                merged_groups[f'methods_{group_index}'] = current_group
+                group_index += 1
+                current_group = []
+
+            # Check if this group needs to be split across multiple shards
+            if len(methods_in_group) > max_elements_per_shard:
+                for i in range(0, len(methods_in_group), max_elements_per_shard):
+                    merged_groups[f'methods_{group_index}'] = methods_in_group[i:i + max_elements_per_shard]
+                    group_index += 1
+            else:
+                current_group = list(methods_in_group)
 
         # Add the last group if not empty
         if current_group:
@@ -1461,8 +1654,9 @@ def cluster_evenly(elements: Dict[str, List[Dict]], max_elements_per_shard: int)
         combined.extend(elements.get('namespaces', []))
         combined.extend(elements.get('templates', []))
 
-        # Sort by line number for deterministic grouping
-        combined.sort(key=lambda x: x.get('lineno', 0))
+        # Sort by line number for deterministic grouping; each type is already in
+        # line order, so this is a merge of a few sorted runs
+        combined.sort(key=LINENO_KEY)
 
         # Split into even chunks
         for i in range(0, len(combined), max_elements_per_shard):
@@ -1484,7 +1678,8 @@ def create_shards(
         max_elements_per_shard: int,
         output_dir: str,
         source_filename: str,
-        language_id: str
+        language_id: str,
+        timestamp: Optional[str] = None
 ) -> int:
     """
     Create shards using the chosen strategy.
@@ -1497,6 +1692,8 @@ def create_shards(
         output_dir (str): Output directory for the shards
         source_filename (str): Name of the source file being sharded
         language_id (str): Programming language identifier
+        timestamp (Optional[str]): Run timestamp for the index file name, so it matches the
+            output directory; the current time is used if omitted
 
     Returns:
         int: The number of shards created
@@ -1518,17 +1715,30 @@ def create_shards(
         clusters = cluster_evenly(elements, max_elements_per_shard)
         strategy_name = "even distribution"
 
-    # Get file extension for the language
+    # Get file extension and comment style for the language
     lang_info = SUPPORTED_LANGUAGES[language_id]
     file_extension = lang_info['extensions'][0]  # Use the first extension as default
+    comment_style = lang_info['comment_style']
+    lang_name = lang_info['name']
+    base_name = Path(source_filename).stem
 
-    # Process clusters
-    for i, (cluster_name, elements_list) in enumerate(clusters.items()):
-        _write_shard(cluster_name, elements_list, imports_and_globals, output_dir,
-                     i + 1, source_filename, language_id, file_extension)
+    # Process clusters; shard files are independent, so larger sets are written from a thread pool
+    write_shard = partial(_write_shard, imports_and_globals=imports_and_globals, output_dir=output_dir,
+                          source_filename=source_filename, language_id=language_id,
+                          file_extension=file_extension, base_name=base_name,
+                          comment_style=comment_style, lang_name=lang_name)
+    if len(clusters) < 4:
+        for i, (cluster_name, elements_list) in enumerate(clusters.items()):
+            write_shard(cluster_name, elements_list, shard_index=i + 1)
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, len(clusters))) as executor:
+            futures = [executor.submit(write_shard, cluster_name, elements_list, shard_index=i + 1)
+                       for i, (cluster_name, elements_list) in enumerate(clusters.items())]
+            for future in futures:
+                future.result()  # Re-raise any write error
 
     # Create an index file
-    _create_element_index(clusters, output_dir, source_filename, language_id)
+    _create_element_index(clusters, output_dir, source_filename, language_id, timestamp)
 
     # Create a README with instructions
     _create_readme(output_dir, len(clusters), strategy_name, source_filename, language_id)
@@ -1544,7 +1754,10 @@ def _write_shard(
         shard_index: int,
         source_filename: str,
         language_id: str,
-        file_extension: str
+        file_extension: str,
+        base_name: str,
+        comment_style: str,
+        lang_name: str
 ) -> None:
     """
     Write a single shard file.
@@ -1558,47 +1771,61 @@ def _write_shard(
         source_filename (str): Name of the original source file
         language_id (str): Programming language identifier
         file_extension (str): File extension for the language
+        base_name (str): Source file name without its extension
+        comment_style (str): Line comment marker for the language
+        lang_name (str): Display name of the language
     """
     # Create shard file name with language and source info
     safe_name = _sanitize_filename(cluster_name)
-    base_name = Path(source_filename).stem
     file_name = f"{base_name}_{language_id}_shard_{shard_index:03d}_{safe_name}{file_extension}"
     file_path = os.path.join(output_dir, file_name)
 
-    # Get comment style for the language
-    comment_style = SUPPORTED_LANGUAGES[language_id]['comment_style']
+    # Build the whole shard, then write it with one call
+    # Add header with shard information
+    parts = [
+        f"{comment_style} Shard {shard_index} - {cluster_name}\n",
+        f"{comment_style} From {lang_name} file: {source_filename}\n",
+        f"{comment_style} Contains {len(elements_list)} elements\n\n"
+    ]
+
+    # Add imports and globals
+    if imports_and_globals.strip():
+        parts.append(imports_and_globals + "\n\n")
 
-    # Write shard
+    # For method shards, include a comment indicating methods belong to a class
+    if 'methods' in cluster_name:
+        # Distinct class names in the order they first appear
+        class_names = list(dict.fromkeys(element['class_name'] for element in elements_list if 'class_name' in element))
+        methods_in_shard = any(class_names)  # Scans the few distinct names, not the elements
+    else:
+        methods_in_shard = False
+
+    if methods_in_shard:
+        parts.append(f"{comment_style} These methods belong to the {', '.join(class_names)} class(es)\n")
+        parts.append(f"{comment_style} The full class definition can be found in the class_definition shard\n\n")
+
+    # Add code elements sorted by line number
+    if cluster_name == 'module_code':
+        # For module-level code, maintain the original line ordering
+        separator = "\n"
+    else:
+        # For functions, classes, etc.
+        separator = "\n\n"
+    try:
+        ordered = sorted(elements_list, key=LINENO_KEY)
+    except KeyError:  # Every parser sets lineno; tolerate hand-built elements without it
+        ordered = sorted(elements_list, key=lambda x: x.get('lineno', 0))
+    if ordered:
+        parts.append(separator.join([element['source'] for element in ordered]))
+        parts.append(separator)
+
+    # Text mode keeps the platform's newline translation
     with open(file_path, 'w', encoding='utf-8') as f:
-        # Add header with shard information
-        f.write(f"{comment_style} Shard {shard_index} - {cluster_name}\n")
-        f.write(f"{comment_style} From {SUPPORTED_LANGUAGES[language_id]['name']} file: {source_filename}\n")
-        f.write(f"{comment_style} Contains {len(elements_list)} elements\n\n")
-
-        # Add imports and globals
-        if imports_and_globals.strip():
-            f.write(imports_and_globals + "\n\n")
-
-        # For method shards, include a comment indicating methods belong to a class
-        methods_in_shard = any(element.get('class_name') for element in elements_list if 'class_name' in element)
-        class_names = set(element.get('class_name') for element in elements_list if 'class_name' in element)
-
-        if methods_in_shard and 'methods' in cluster_name:
-            f.write(f"{comment_style} These methods belong to the {', '.join(class_names)} class(es)\n")
-            f.write(f"{comment_style} The full class definition can be found in the class_definition shard\n\n")
-
-        # Add code elements sorted by line number
-        if cluster_name == 'module_code':
-            # For module-level code, maintain the original line ordering
-            for element in sorted(elements_list, key=lambda x: x.get('lineno', 0)):
-                f.write(element['source'] + "\n")
-        else:
-            # For functions, classes, etc.
-            for element in sorted(elements_list, key=lambda x: x.get('lineno', 0)):
-                f.write(element['source'] + "\n\n")
+        f.write(''.join(parts))
 
 
-def _create_element_index(clusters: Dict, output_dir: str, source_filename: str, language_id: str) -> Dict:
+def _create_element_index(clusters: Dict, output_dir: str, source_filename: str, language_id: str,
+                          timestamp: Optional[str] = None) -> Dict:
     """
     Create an enhanced index mapping element names to their metadata.
 
@@ -1610,17 +1837,22 @@ def _create_element_index(clusters: Dict, output_dir: str, source_filename: str,
         output_dir (str): Output directory for the index
         source_filename (str): Name of the original source file
         language_id (str): Programming language identifier
+        timestamp (Optional[str]): Run timestamp for the file name (defaults to now)
 
     Returns:
         Dict: The created index
     """
     index = {}
     base_name = Path(source_filename).stem
+    file_extension = SUPPORTED_LANGUAGES[language_id]['extensions'][0]
+    is_cpp = language_id == 'cpp'
+    # Every entry repeats these values; interned, they all share one string object
+    language_id = sys.intern(language_id)
 
     for i, (cluster_name, elements_list) in enumerate(clusters.items()):
         safe_name = _sanitize_filename(cluster_name)
-        file_extension = SUPPORTED_LANGUAGES[language_id]['extensions'][0]
         file_name = f"{base_name}_{language_id}_shard_{i + 1:03d}_{safe_name}{file_extension}"
+        element_type = sys.intern(cluster_name.split('_', 1)[0])
 
         for element in elements_list:
             if 'name' in element:
@@ -1628,19 +1860,21 @@ def _create_element_index(clusters: Dict, output_dir: str, source_filename: str,
                 entry = {
                     "shard": file_name,
                     "language": language_id,
-                    "element_type": cluster_name.split('_')[0] if '_' in cluster_name else cluster_name
+                    "element_type": element_type
                 }
 
                 # Extract parameters if available
-                if 'parameters' in element and element['parameters']:
-                    entry["parameters"] = element['parameters']
+                parameters = element.get('parameters')
+                if parameters:
+                    entry["parameters"] = parameters
 
                 # Extract return type if available
-                if 'return_type' in element and element['return_type']:
-                    entry["return_type"] = element['return_type']
+                return_type = element.get('return_type')
+                if return_type:
+                    entry["return_type"] = return_type
 
                 # Add C++-specific metadata
-                if language_id == 'cpp':
+                if is_cpp:
                     if 'type' in element:  # For classes (class vs struct)
                         entry["cpp_type"] = element['type']
 
@@ -1648,11 +1882,18 @@ def _create_element_index(clusters: Dict, output_dir: str, source_filename: str,
                 index[element['name']] = entry
 
     # Create index file name with language and source info
-    index_filename = f"{base_name}_{language_id}_index_{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    if timestamp is None:
+        timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    index_filename = f"{base_name}_{language_id}_index_{timestamp}.json"
 
     # Write index file
-    with open(os.path.join(output_dir, index_filename), 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2, sort_keys=True)
+    index_path = os.path.join(output_dir, index_filename)
+    if ORJSON_AVAILABLE:
+        with open(index_path, 'wb') as f:
+            f.write(orjson.dumps(index, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    else:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(index, indent=2, sort_keys=True))
 
     return index
 
@@ -1671,55 +1912,58 @@ def _create_readme(output_dir: str, num_shards: int, strategy: str, source_filen
     base_name = Path(source_filename).stem
     lang_name = SUPPORTED_LANGUAGES[language_id]['name']
 
+    parts = []
+    parts.append(f"# {lang_name} Shards - {source_filename}\n\n")
+    parts.append(
+        f"This directory contains {num_shards} shards of {lang_name} code from `{source_filename}` grouped by {strategy}.\n\n")
+
+    parts.append("## How to use with AI assistants\n\n")
+    parts.append("1. **Upload the index.json file first**\n")
+    parts.append(
+        f"   - The index contains a complete map of all functions, classes, and methods from {source_filename}\n")
+    parts.append(
+        "   - IMPORTANT: Tell the AI that \"this index is complete and contains ALL existing elements in this specific source file\"\n")
+    parts.append("   - This prevents the AI from hallucinating non-existent functions or classes\n\n")
+
+    parts.append("2. **Upload shards in logical groups**\n")
+    parts.append("   - Start with the most relevant shards for your questions\n")
+    parts.append("   - Not all shards need to be uploaded at once\n\n")
+
+    parts.append("3. **Reference the index to find specific elements**\n")
+    parts.append("   - Use the index to locate which shard contains a function you want to examine\n")
+    parts.append("   - The index includes parameter and return type information\n\n")
+
+    parts.append("4. **Ask the AI to analyze specific shards**\n")
+    parts.append("   - Request explanations of functions, classes, or their relationships\n")
+    parts.append("   - The AI can help you understand the code structure\n\n")
+
+    if language_id == 'cpp':
+        parts.append("## C++-specific tips\n\n")
+        parts.append(
+            "- Header files (.h/.hpp) contain declarations; implementation files (.cpp/.cc) contain definitions\n")
+        parts.append("- Template instantiations may appear in multiple files\n")
+        parts.append("- Namespace usage affects how symbols are resolved\n")
+        parts.append("- Forward declarations create dependencies between files\n\n")
+
+    parts.append("## Tips for effective code analysis\n\n")
+    parts.append("- Ask for an overall description of the code structure and purpose\n")
+    parts.append("- Request explanations of specific functions or classes\n")
+    parts.append("- Have the AI identify connections between different components\n")
+    parts.append("- Request diagrams for complex relationships or workflows\n")
+    parts.append("- Ask for usage examples\n")
+    parts.append("- Request code reviews to identify potential bugs or improvements\n")
+    parts.append("- For complex multi-step operations, ask the AI to explain the flow\n\n")
+
+    parts.append("## Preventing AI hallucination\n\n")
+    parts.append("To prevent the AI from inventing non-existent code elements:\n\n")
+    parts.append("1. **Always upload the index.json file first**\n")
+    parts.append(
+        "2. **Explicitly instruct the AI that \"this index is complete and contains ALL existing code elements from this specific file\"**\n")
+    parts.append("3. **If the AI mentions a function not in the index, remind it to check the index**\n")
+    parts.append("4. **Ask the AI to verify claims against the available code**\n")
+
     with open(os.path.join(output_dir, "README.md"), 'w', encoding='utf-8') as f:
-        f.write(f"# {lang_name} Shards - {source_filename}\n\n")
-        f.write(
-            f"This directory contains {num_shards} shards of {lang_name} code from `{source_filename}` grouped by {strategy}.\n\n")
-
-        f.write("## How to use with AI assistants\n\n")
-        f.write("1. **Upload the index.json file first**\n")
-        f.write(
-            f"   - The index contains a complete map of all functions, classes, and methods from {source_filename}\n")
-        f.write(
-            "   - IMPORTANT: Tell the AI that \"this index is complete and contains ALL existing elements in this specific source file\"\n")
-        f.write("   - This prevents the AI from hallucinating non-existent functions or classes\n\n")
-
-        f.write("2. **Upload shards in logical groups**\n")
-        f.write("   - Start with the most relevant shards for your questions\n")
-        f.write("   - Not all shards need to be uploaded at once\n\n")
-
-        f.write("3. **Reference the index to find specific elements**\n")
-        f.write("   - Use the index to locate which shard contains a function you want to examine\n")
-        f.write("   - The index includes parameter and return type information\n\n")
-
-        f.write("4. **Ask the AI to analyze specific shards**\n")
-        f.write("   - Request explanations of functions, classes, or their relationships\n")
-        f.write("   - The AI can help you understand the code structure\n\n")
-
-        if language_id == 'cpp':
-            f.write("## C++-specific tips\n\n")
-            f.write(
-                "- Header files (.h/.hpp) contain declarations; implementation files (.cpp/.cc) contain definitions\n")
-            f.write("- Template instantiations may appear in multiple files\n")
-            f.write("- Namespace usage affects how symbols are resolved\n")
-            f.write("- Forward declarations create dependencies between files\n\n")
-
-        f.write("## Tips for effective code analysis\n\n")
-        f.write("- Ask for an overall description of the code structure and purpose\n")
-        f.write("- Request explanations of specific functions or classes\n")
-        f.write("- Have the AI identify connections between different components\n")
-        f.write("- Request diagrams for complex relationships or workflows\n")
-        f.write("- Ask for usage examples\n")
-        f.write("- Request code reviews to identify potential bugs or improvements\n")
-        f.write("- For complex multi-step operations, ask the AI to explain the flow\n\n")
-
-        f.write("## Preventing AI hallucination\n\n")
-        f.write("To prevent the AI from inventing non-existent code elements:\n\n")
-        f.write("1. **Always upload the index.json file first**\n")
-        f.write(
-            "2. **Explicitly instruct the AI that \"this index is complete and contains ALL existing code elements from this specific file\"**\n")
-        f.write("3. **If the AI mentions a function not in the index, remind it to check the index**\n")
-        f.write("4. **Ask the AI to verify claims against the available code**\n")
+        f.write(''.join(parts))
 
 
 # Improved rich-based user interface
@@ -1889,7 +2133,8 @@ def display_rich_interface():
                 max_per_shard,
                 final_output_dir,
                 source_filename,
-                language_id
+                language_id,
+                current_time
             )
 
             strategy_name = {
@@ -1942,11 +2187,13 @@ def command_line_interface():
 
     Provides a text-based interface when the Rich library is not available.
     """
-    print("\n=== Multi-Language File Sharding Tool v2.0 ===\n")
-    print("This tool helps you break down large source code files into manageable shards.")
-    print(f"Supported languages: {', '.join(lang_info['name'] for lang_info in SUPPORTED_LANGUAGES.values())}")
-    print(f"Supported file types: {', '.join(get_supported_extensions())}")
-    print("Enhanced with detailed metadata in the index.json output.\n")
+    print("\n".join([
+        "\n=== Multi-Language File Sharding Tool v2.0 ===\n",
+        "This tool helps you break down large source code files into manageable shards.",
+        f"Supported languages: {', '.join(lang_info['name'] for lang_info in SUPPORTED_LANGUAGES.values())}",
+        f"Supported file types: {', '.join(get_supported_extensions())}",
+        "Enhanced with detailed metadata in the index.json output.\n"
+    ]))
 
     # Get user inputs
     while True:
@@ -1991,11 +2238,10 @@ def command_line_interface():
 
     # Display file analysis
     element_counts = {k: len(v) for k, v in elements.items() if v}
-    print(f"\nFound elements in the {lang_name} file:")
-    for element_type, count in element_counts.items():
-        if count > 0:
-            display_name = element_type.replace('_', ' ').title()
-            print(f"  {display_name}: {count}")
+    print("\n".join([f"\nFound elements in the {lang_name} file:"] + [
+        f"  {element_type.replace('_', ' ').title()}: {count}"
+        for element_type, count in element_counts.items() if count > 0
+    ]))
 
     # Check if we have any code elements
     total_elements = sum(
@@ -2029,11 +2275,13 @@ def command_line_interface():
             return
 
     # Get sharding strategy
-    print("\nSharding Strategies:")
-    print("1. Group by type (functions, classes, etc.)")
-    print("2. Group by name prefixes/patterns")
-    print("3. Group by comments/docstring similarity")
-    print("4. Simple even distribution")
+    print("\n".join([
+        "\nSharding Strategies:",
+        "1. Group by type (functions, classes, etc.)",
+        "2. Group by name prefixes/patterns",
+        "3. Group by comments/docstring similarity",
+        "4. Simple even distribution"
+    ]))
 
     while True:
         try:
@@ -2093,24 +2341,25 @@ def command_line_interface():
             max_per_shard,
             output_dir,
             source_filename,
-            language_id
+            language_id,
+            current_time
         )
 
-        print("\nSharding complete!")
-        print(f"Language: {lang_name}")
-        print(f"Source file: {source_filename}")
-        print(f"Output directory: {os.path.abspath(output_dir)}")
-        print(f"Strategy used: {strategy_name}")
-        print(f"Number of shards: {num_shards}")
-        print(f"\nIndex includes enhanced metadata with parameter and return type information.")
-
-        print("\n=== IMPORTANT: Using with AI Assistants ===")
-        print("1. Upload the language-specific index.json file first")
-        print(
-            "2. Tell the AI: \"This index is complete and contains ALL existing elements from this specific source file\"")
-        print("3. This prevents the AI from hallucinating non-existent functions or classes")
-        print("4. Then upload specific shards as needed for detailed analysis")
-        print("5. When working with multiple files, keep indices separate to maintain accuracy")
+        print("\n".join([
+            "\nSharding complete!",
+            f"Language: {lang_name}",
+            f"Source file: {source_filename}",
+            f"Output directory: {os.path.abspath(output_dir)}",
+            f"Strategy used: {strategy_name}",
+            f"Number of shards: {num_shards}",
+            "\nIndex includes enhanced metadata with parameter and return type information.",
+            "\n=== IMPORTANT: Using with AI Assistants ===",
+            "1. Upload the language-specific index.json file first",
+            "2. Tell the AI: \"This index is complete and contains ALL existing elements from this specific source file\"",
+            "3. This prevents the AI from hallucinating non-existent functions or classes",
+            "4. Then upload specific shards as needed for detailed analysis",
+            "5. When working with multiple files, keep indices separate to maintain accuracy"
+        ]))
 
     except Exception as e:
         print(f"Error during sharding: {e}")